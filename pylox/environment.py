@@ -4,20 +4,20 @@ from exception import RuntimeException
 
 class Environment:
 
-    def __init__(self, enclosing=None):
+    def __init__(self, enclosing=None, values: dict[str, object] = None):
         self.enclosing = enclosing
-        self.defined = set()
-        self.values = dict()
+        # Names declared without a value, which cannot be read until assigned.
+        self.declared = set()
+        self.values = values if values is not None else dict()
 
     def define(self, name: str):
-        self.defined.add(name)
+        self.declared.add(name)
 
     def initialize(self, name: str, value: object):
-        self.define(name)
         self.values[name] = value
 
     def assign(self, name: Token, value: object):
-        if name.lexeme in self.defined:
+        if name.lexeme in self.values or name.lexeme in self.declared:
             self.values[name.lexeme] = value
             return
 
@@ -31,9 +31,9 @@ class Environment:
         self.ancestor(distance).values[name.lexeme] = value
 
     def get(self, name: Token) -> object:
-        self.check_initialized(name)
         if name.lexeme in self.values:
             return self.values[name.lexeme]
+        self.check_initialized(name)
 
         if self.enclosing is not None:
             return self.enclosing.get(name)
@@ -45,12 +45,8 @@ class Environment:
         ancestor.check_initialized(name)
         return ancestor.values[name.lexeme]
 
-    def get_at_no_check(self, distance: int, name: str) -> object:
-        ancestor = self.ancestor(distance)
-        return ancestor.values[name]
-
     def check_initialized(self, name: Token):
-        if name.lexeme in self.defined and name.lexeme not in self.values:
+        if name.lexeme in self.declared and name.lexeme not in self.values:
             raise RuntimeException(name, "Accessing uninitialized variable '{}'.".format(name.lexeme))
 
     def ancestor(self, distance: int) -> "Environment":
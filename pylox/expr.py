@@ -25,6 +25,12 @@ class Expr:
         def visit_grouping_expr(self, expr: 'Grouping'):
             raise NotImplementedError
 
+        def visit_hashmap_expr(self, expr: 'HashMap'):
+            raise NotImplementedError
+
+        def visit_hashset_expr(self, expr: 'HashSet'):
+            raise NotImplementedError
+
         def visit_lambda_expr(self, expr: 'Lambda'):
             raise NotImplementedError
 
@@ -121,6 +127,25 @@ class Grouping(Expr):
         return visitor.visit_grouping_expr(self)
 
 
+class HashMap(Expr):
+    def __init__(self, keys: list[Expr], values: list[Expr], brace: Token):
+        self.keys = keys
+        self.values = values
+        self.brace = brace
+
+    def accept(self, visitor):
+        return visitor.visit_hashmap_expr(self)
+
+
+class HashSet(Expr):
+    def __init__(self, elements: list[Expr], brace: Token):
+        self.elements = elements
+        self.brace = brace
+
+    def accept(self, visitor):
+        return visitor.visit_hashset_expr(self)
+
+
 class Lambda(Expr):
     def __init__(self, params: list[Token], body: list['Stmt']):
         self.params = params
@@ -0,0 +1,96 @@
+import gc
+import os.path
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from parser import Parser
+from scanner import Scanner
+from lox_token import Token
+from stmt import Stmt
+from token_type import TokenType
+
+
+class Errors:
+    """
+    A reporter for the worker processes, which only records that a file has
+    errors. Such a file is scanned and parsed again when it is imported, so
+    that its errors are reported in order.
+    """
+
+    def __init__(self):
+        self.had_error = False
+
+    def error(self, line: int, message: str):
+        self.had_error = True
+
+    def parse_error(self, token: Token, message: str):
+        self.had_error = True
+
+
+def find_imports(tokens: list[Token]) -> list[str]:
+    return [os.path.realpath(token.lexeme) for token in tokens if token.type == TokenType.IMPORT and os.path.exists(token.lexeme)]
+
+
+def parse_file(path: str) -> tuple[int, list[str], bytes]:
+    """
+    The modification time, imports and pickled statements of a file, or None
+    for the statements when it has syntax errors.
+    """
+    errors = Errors()
+    modified = os.stat(path).st_mtime_ns
+    with open(path) as f:
+        tokens = Scanner(errors, f.read()).scan_tokens()
+    statements = Parser(errors, tokens).parse()
+    if errors.had_error:
+        return modified, find_imports(tokens), None
+    return modified, find_imports(tokens), pickle.dumps(statements, pickle.HIGHEST_PROTOCOL)
+
+
+def load_statements(data: bytes) -> list[Stmt]:
+    # Collections triggered while the tree is built would walk all of it
+    # again and again.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(data)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def parse_imports(source: str, workers: int = None) -> dict[str, tuple[int, bytes]]:
+    """
+    Scans and parses the files imported by `source`, directly or through
+    other files, in `workers` processes. The statements come back pickled,
+    to be loaded when the file is imported, keyed by canonical path with the
+    modification time of the file.
+    """
+    parsed = dict()
+    seen = set(find_imports(Scanner(Errors(), source).scan_tokens()))
+    if not seen:
+        return parsed
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = {pool.submit(parse_file, path): path for path in seen}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                # Files which could not be read, or whose statements could
+                # not be pickled, are left to the import, and so is every
+                # file still pending once a worker has died.
+                try:
+                    modified, imports, data = future.result()
+                except BrokenProcessPool:
+                    return parsed
+                except (OSError, RuntimeError, pickle.PicklingError):
+                    continue
+
+                if data is not None:
+                    parsed[path] = (modified, data)
+                for imported in imports:
+                    if imported not in seen:
+                        seen.add(imported)
+                        pending[pool.submit(parse_file, imported)] = imported
+    return parsed
@@ -1,40 +1,87 @@
+from typing import Generator
+
 from environment import Environment
 from exception import ReturnException
 from instance import Instance
 from lox_callable import Callable
-from stmt import Function
+from stmt import Function, Return
+
+
+class CallDescriptor:
+    """
+    What calling a function declaration requires, computed once and shared by
+    every closure and bound method created from it. It is kept on the
+    declaration, so it is freed together with the AST.
+    """
+
+    def __init__(self, declaration: Function):
+        self.params = tuple(param.lexeme for param in declaration.params)
+        self.arity = len(self.params)
+        self.body = declaration.body
+
+    @classmethod
+    def of(cls, declaration: Function) -> "CallDescriptor":
+        descriptor = getattr(declaration, "descriptor", None)
+        if descriptor is None:
+            descriptor = declaration.descriptor = cls(declaration)
+        return descriptor
 
 
 class LoxFunction(Callable):
 
-    def __init__(self, declaration: Function, closure: Environment, is_initializer: bool = False, is_getter: bool = False):
+    def __init__(self, declaration: Function, closure: Environment, is_initializer: bool = False, is_getter: bool = False, descriptor: CallDescriptor = None, this: [Instance, "LoxClass"] = None):
         self.declaration = declaration
         self.closure = closure
         self.is_initializer = is_initializer
         self.is_getter = is_getter
+        self.descriptor = descriptor if descriptor is not None else CallDescriptor.of(declaration)
+        self.this = this
 
     def arity(self) -> int:
-        return len(self.declaration.params)
+        return self.descriptor.arity
 
     def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
-        environment = Environment(self.closure)
-        for i in range(len(self.declaration.params)):
-            environment.initialize(self.declaration.params[i].lexeme, arguments[i])
+        return interpreter.stackless.run(self.routine(interpreter, arguments))
+
+    def routine(self, interpreter: "Interpreter", arguments: list[object], this: [Instance, "LoxClass"] = None) -> Generator:
+        """
+        Passing `this` invokes a method on it without binding the method first.
+        """
+        if this is None:
+            this = self.this
+
+        descriptor = self.descriptor
+        values = dict(zip(descriptor.params, arguments))
+        if this is not None:
+            values["this"] = this
+        environment = Environment(self.closure, values)
 
+        # Same as Stackless.execute_block, except that a return statement of
+        # the body itself hands its value back without raising.
+        suspendable = interpreter.suspendable
+        previous = interpreter.environment
+        value = None
         try:
-            interpreter.execute_block(self.declaration.body, environment)
+            interpreter.environment = environment
+            for statement in descriptor.body:
+                if statement not in suspendable:
+                    statement.accept(interpreter)
+                elif type(statement) is Return:
+                    value = yield from statement.value.accept(interpreter.stackless)
+                    break
+                else:
+                    yield from statement.accept(interpreter.stackless)
         except ReturnException as return_value:
-            if self.is_initializer:
-                return self.closure.get_at_no_check(0, "this")
-            return return_value.value
+            value = return_value.value
+        finally:
+            interpreter.environment = previous
 
         if self.is_initializer:
-            return self.closure.get_at_no_check(0, "this")
+            return this
+        return value
 
     def bind(self, instance: [Instance, "LoxClass"]) -> "LoxFunction":
-        environment = Environment(self.closure)
-        environment.initialize("this", instance)
-        return LoxFunction(self.declaration, environment, self.is_initializer, self.is_getter)
+        return LoxFunction(self.declaration, self.closure, self.is_initializer, self.is_getter, self.descriptor, instance)
 
     def __str__(self) -> str:
         if self.declaration.name is not None:
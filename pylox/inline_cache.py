@@ -0,0 +1,96 @@
+from function import LoxFunction
+
+
+class InlineCache:
+    """
+    The methods a property access site found, per receiver class. A
+    redefined class is a new LoxClass, so it never hits stale entries.
+    """
+
+    limit = 4
+
+    def __init__(self, name: str):
+        self.name = name
+        self.klass = None
+        self.method = None
+        self.classes = dict()
+        self.overflowed = False
+        self.hits = 0
+        self.misses = 0
+
+    def find_method(self, klass: "LoxClass") -> LoxFunction:
+        if klass is self.klass:
+            self.hits += 1
+            return self.method
+        if klass in self.classes:
+            self.hits += 1
+            return self.classes[klass]
+
+        self.misses += 1
+        method = klass.find_method(self.name)
+        if self.klass is None:
+            self.klass = klass
+            self.method = method
+        elif len(self.classes) < self.limit - 1:
+            self.classes[klass] = method
+        else:
+            self.overflowed = True
+        return method
+
+    def is_megamorphic(self) -> bool:
+        return self.overflowed
+
+
+class FieldCache:
+    """
+    Where a field assignment site stores its value, per receiver shape. A
+    shape implies its class.
+    """
+
+    limit = 4
+
+    def __init__(self):
+        self.shape = None
+        self.slot = None
+        self.next_shape = None
+        self.shapes = dict()
+        self.overflowed = False
+        self.hits = 0
+        self.misses = 0
+
+    def set(self, objekt: "Instance", name: "Token", value: object):
+        shape = objekt.shape
+        if shape is self.shape and shape is not None:
+            self.hits += 1
+            slot, next_shape = self.slot, self.next_shape
+        elif shape in self.shapes:
+            self.hits += 1
+            slot, next_shape = self.shapes[shape]
+        else:
+            self.misses += 1
+            objekt.set(name, value)
+            if shape is not None and objekt.shape is not None:
+                self.add(shape, objekt.shape, name.lexeme)
+            return
+
+        if next_shape is None:
+            objekt.values[slot] = value
+        else:
+            objekt.shape = next_shape
+            objekt.values.append(value)
+
+    def add(self, shape: "Shape", next_shape: "Shape", name: str):
+        slot = shape.slots.get(name)
+        if slot is not None:
+            next_shape = None
+        if self.shape is None:
+            self.shape = shape
+            self.slot = slot
+            self.next_shape = next_shape
+        elif len(self.shapes) < self.limit - 1:
+            self.shapes[shape] = (slot, next_shape)
+        else:
+            self.overflowed = True
+
+    def is_megamorphic(self) -> bool:
+        return self.overflowed
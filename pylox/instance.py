@@ -3,14 +3,31 @@ from lox_token import Token
 
 
 class Instance:
+    """
+    Fields are stored in `values`, a list laid out by `shape`, or a dictionary
+    from field name to value once `shape` is None.
+    """
+
+    __slots__ = ("klass", "shape", "values")
 
     def __init__(self, klass: "LoxClass"):
         self.klass = klass
-        self.fields = dict()
+        self.shape = klass.shape
+        self.values = []
+
+    def has_field(self, name: str) -> bool:
+        if self.shape is None:
+            return name in self.values
+        return name in self.shape.slots
 
     def get(self, name: Token) -> object:
-        if name.lexeme in self.fields:
-            return self.fields[name.lexeme]
+        if self.shape is None:
+            if name.lexeme in self.values:
+                return self.values[name.lexeme]
+        else:
+            slot = self.shape.slots.get(name.lexeme)
+            if slot is not None:
+                return self.values[slot]
 
         method = self.klass.find_method(name.lexeme)
         if method is not None:
@@ -19,7 +36,20 @@ class Instance:
         raise RuntimeException(name, "Property not found.")
 
     def set(self, name: Token, value: object):
-        self.fields[name.lexeme] = value
+        shape = self.shape
+        if shape is not None:
+            slot = shape.slots.get(name.lexeme)
+            if slot is not None:
+                self.values[slot] = value
+                return
+            next_shape = shape.add(name.lexeme)
+            if next_shape is not None:
+                self.shape = next_shape
+                self.values.append(value)
+                return
+            self.shape = None
+            self.values = dict(zip(shape.slots, self.values))
+        self.values[name.lexeme] = value
 
     def __str__(self) -> str:
         return "{} instance".format(self.klass.name)
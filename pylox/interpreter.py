@@ -1,14 +1,26 @@
+import asyncio
+import operator
 import os.path
-
-from array import LoxArray
+from array import array
+from itertools import repeat
+
+from lox_array import LoxArray
+from lox_bytes import LoxBytes, is_byte
+from lox_file import LoxStdin
+from lox_map import LoxMap, LoxSet, is_key
+from lox_string import LoxMappedString, LoxStringBuilder
 from instance import Instance
 from lox_callable import Callable
 from lox_class import LoxClass
 from environment import Environment
-from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
+from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, HashMap, HashSet, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
 from exception import BreakUnwindStackException, IndexException, NativeException, ReturnException, RuntimeException
+from frontend import load_statements
 from function import LoxFunction
-from native import ArrayCallable, Char, Clock, Inner, Int, Length, NoOp, ReadFile, WriteFile
+from inline_cache import FieldCache, InlineCache
+from output import Output
+from native import Append, ArrayCallable, Await, Bisect, Build, BuilderCallable, BytesCallable, CacheStats, Char, Clock, Close, Concat, Copy, Decode, DeleteFile, DequeCallable, Dot, EachLine, Fill, Find, Flush, Gather, HeapCallable, Inner, Int, Join, Keys, Length, Lower, MapFile, Max, Memoize, Memoized, MemoStats, Min, NoOp, Number, Open, Peek, PeekFront, Pop, PopFront, Push, PushFront, ReadAsync, ReadBytes, ReadChunk, ReadFile, ReadLine, ReadLines, Reload, Remove, Replace, Reverse, Ring, SetCallable, Shell, Slice, Sort, Split, StartsWith, Substr, Sum, Trim, Upper, Values, View, Write, WriteAsync, WriteFile
+from stackless import CallFinder, Stackless
 from stmt import Block, Break, Class, Expression, Function, If, Import, Print, Return, Stmt, Var, While
 from lox_token import Token
 from token_type import TokenType
@@ -17,39 +29,153 @@ from util import clean_index, stringify
 
 class Interpreter(Expr.Visitor, Stmt.Visitor):
 
-    def __init__(self, reporter: "Lox", is_repl: bool = False):
+    def __init__(self, reporter: "Lox", is_repl: bool = False, output: Output = None):
         super().__init__()
         self.reporter = reporter
         self.is_repl = is_repl
+        self.output = output if output is not None else Output()
         self.globals = Environment()
         self.environment = self.globals
         self.locals = dict()
-
+        self.local_names = set()
+        self.lambdas = dict()
+        self.inline_caches = []
+        self.suspendable = set()
+        self.files = set()
+        self.modules = dict()
+        self.parsed = dict()
+        self.loop = None
+        self.stackless = Stackless(self)
+
+        self.globals.initialize("append", Append())
         self.globals.initialize("array", ArrayCallable())
+        self.globals.initialize("await", Await())
+        self.globals.initialize("bisect", Bisect())
+        self.globals.initialize("build", Build())
+        self.globals.initialize("builder", BuilderCallable())
+        self.globals.initialize("bytes", BytesCallable())
+        self.globals.initialize("cachestats", CacheStats())
         self.globals.initialize("chr", Char())
         self.globals.initialize("clock", Clock())
+        self.globals.initialize("close", Close())
+        self.globals.initialize("concat", Concat())
+        self.globals.initialize("copy", Copy())
+        self.globals.initialize("decode", Decode())
+        self.globals.initialize("deletefile", DeleteFile())
+        self.globals.initialize("deque", DequeCallable())
+        self.globals.initialize("dot", Dot())
+        self.globals.initialize("eachline", EachLine())
+        self.globals.initialize("fill", Fill())
+        self.globals.initialize("find", Find())
+        self.globals.initialize("flush", Flush())
+        self.globals.initialize("gather", Gather())
+        self.globals.initialize("heap", HeapCallable())
         self.globals.initialize("inner", Inner())
         self.globals.initialize("int", Int())
+        self.globals.initialize("join", Join())
+        self.globals.initialize("keys", Keys())
         self.globals.initialize("len", Length())
+        self.globals.initialize("lower", Lower())
+        self.globals.initialize("mapfile", MapFile())
+        self.globals.initialize("max", Max())
+        self.globals.initialize("memoize", Memoize())
+        self.globals.initialize("memostats", MemoStats())
+        self.globals.initialize("min", Min())
         self.globals.initialize("noop", NoOp())
+        self.globals.initialize("number", Number())
+        self.globals.initialize("open", Open())
+        self.globals.initialize("peek", Peek())
+        self.globals.initialize("peekfront", PeekFront())
+        self.globals.initialize("pop", Pop())
+        self.globals.initialize("popfront", PopFront())
+        self.globals.initialize("push", Push())
+        self.globals.initialize("pushfront", PushFront())
+        self.globals.initialize("readasync", ReadAsync())
+        self.globals.initialize("readbytes", ReadBytes())
+        self.globals.initialize("readchunk", ReadChunk())
         self.globals.initialize("readfile", ReadFile())
+        self.globals.initialize("readline", ReadLine())
+        self.globals.initialize("readlines", ReadLines())
+        self.globals.initialize("reload", Reload())
+        self.globals.initialize("remove", Remove())
+        self.globals.initialize("replace", Replace())
+        self.globals.initialize("reverse", Reverse())
+        self.globals.initialize("ring", Ring())
+        self.globals.initialize("set", SetCallable())
+        self.globals.initialize("shell", Shell())
+        self.globals.initialize("slice", Slice())
+        self.globals.initialize("sort", Sort())
+        self.globals.initialize("split", Split())
+        self.globals.initialize("startswith", StartsWith())
+        self.globals.initialize("stdin", LoxStdin(self.output))
+        self.globals.initialize("substr", Substr())
+        self.globals.initialize("sum", Sum())
+        self.globals.initialize("trim", Trim())
+        self.globals.initialize("upper", Upper())
+        self.globals.initialize("values", Values())
+        self.globals.initialize("view", View())
+        self.globals.initialize("write", Write())
+        self.globals.initialize("writeasync", WriteAsync())
         self.globals.initialize("writefile", WriteFile())
 
     def interpret(self, statements: list[Stmt]):
+        self.suspendable.update(CallFinder().find(statements))
         try:
             for statement in statements:
                 self.execute(statement)
         except (IndexException, NativeException) as error:
+            self.flush()
             self.reporter.exception_error(error)
         except RuntimeException as error:
+            self.flush()
             self.reporter.runtime_error(error)
+        finally:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes what is buffered for the output and the files the script has
+        open, so nothing written before an error is lost.
+        """
+        self.output.flush()
+        for handle in self.files:
+            handle.flush()
+
+    def close(self):
+        """
+        Flushes the output and closes the files the script left open, when
+        the interpreter exits. I/O operations still running on the event
+        loop are finished first.
+        """
+        if self.loop is not None:
+            loop = self.loop
+            pending = asyncio.all_tasks(loop)
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+            self.loop = None
+        self.output.flush()
+        for handle in self.files:
+            handle.close()
+        self.files.clear()
+
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        The event loop running the I/O natives, created when the first one
+        is called.
+        """
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+        return self.loop
 
     def visit_array_expr(self, expr: Array) -> object:
         return LoxArray([self.evaluate(element) for element in expr.elements])
 
     def visit_assign_expr(self, expr: Assign) -> object:
-        value = self.evaluate(expr.value)
+        return self.assign_variable(expr, self.evaluate(expr.value))
 
+    def assign_variable(self, expr: Assign, value: object) -> object:
         distance = self.locals.get(expr)
         if distance is not None:
             self.environment.assign_at(distance, expr.name, value)
@@ -61,45 +187,81 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     def visit_binary_expr(self, expr: Binary) -> object:
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
-
+        return self.binary_operation(expr, left, right)
+
+    elementwise_operations = {
+        TokenType.GREATER: operator.gt,
+        TokenType.GREATER_EQUAL: operator.ge,
+        TokenType.LESS: operator.lt,
+        TokenType.LESS_EQUAL: operator.le,
+        TokenType.MINUS: operator.sub,
+        TokenType.PLUS: operator.add,
+        TokenType.SLASH: operator.truediv,
+        TokenType.STAR: operator.mul,
+    }
+
+    def binary_operation(self, expr: Binary, left: object, right: object) -> object:
         if expr.operator.type == TokenType.COMMA:
             return right
         elif expr.operator.type == TokenType.EQUAL_EQUAL:
             return self.is_equal(left, right)
         elif expr.operator.type == TokenType.BANG_EQUAL:
             return not self.is_equal(left, right)
-        elif expr.operator.type == TokenType.GREATER:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) > float(right)
-        elif expr.operator.type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) >= float(right)
-        elif expr.operator.type == TokenType.LESS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) < float(right)
-        elif expr.operator.type == TokenType.LESS_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) <= float(right)
-        elif expr.operator.type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) - float(right)
-        elif expr.operator.type == TokenType.PLUS:
-            if isinstance(left, float) and isinstance(right, float):
-                return float(left) + float(right)
-            elif isinstance(left, str) or isinstance(right, str):
-                return str(left) + str(right)
+
+        if isinstance(left, float) and isinstance(right, float):
+            if expr.operator.type == TokenType.GREATER:
+                return left > right
+            elif expr.operator.type == TokenType.GREATER_EQUAL:
+                return left >= right
+            elif expr.operator.type == TokenType.LESS:
+                return left < right
+            elif expr.operator.type == TokenType.LESS_EQUAL:
+                return left <= right
+            elif expr.operator.type == TokenType.MINUS:
+                return left - right
+            elif expr.operator.type == TokenType.PLUS:
+                return left + right
+            elif expr.operator.type == TokenType.SLASH:
+                if right == 0:
+                    raise RuntimeException(expr.operator, "Division by zero.")
+                return left / right
+            elif expr.operator.type == TokenType.STAR:
+                return left * right
+        elif expr.operator.type == TokenType.PLUS and (isinstance(left, str) or isinstance(right, str)):
+            return str(left) + str(right)
+        elif isinstance(left, LoxArray) or isinstance(right, LoxArray):
+            operation = self.elementwise_operations.get(expr.operator.type)
+            if operation is not None and not isinstance(left, str) and not isinstance(right, str):
+                return self.elementwise_operation(expr, operation, left, right)
+
+        if expr.operator.type == TokenType.PLUS:
             raise RuntimeException(expr.operator, "Operands must be two numbers or two strings.")
-        elif expr.operator.type == TokenType.SLASH:
-            self.check_number_operands(expr.operator, left, right)
-            if float(right) == 0:
-                raise RuntimeException(expr.operator, "Division by zero.")
-            return float(left) / float(right)
-        elif expr.operator.type == TokenType.STAR:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) * float(right)
-
-        # Unreachable.
-        return None
+        raise RuntimeException(expr.operator, "Operands must be numbers.")
+
+    def elementwise_operation(self, expr: Binary, operation: "types.BuiltinFunctionType", left: object, right: object) -> LoxArray:
+        """
+        Applies `operation` to the elements of two arrays of the same length,
+        or of an array and a number.
+        """
+        operands = []
+        for operand in (left, right):
+            if isinstance(operand, LoxArray):
+                if not operand.holds_numbers():
+                    raise RuntimeException(expr.operator, "Array operands must only hold numbers.")
+                operands.append(operand.elements)
+            elif isinstance(operand, float):
+                operands.append(repeat(operand))
+            else:
+                raise RuntimeException(expr.operator, "Operands must be numbers or arrays of numbers.")
+
+        if isinstance(left, LoxArray) and isinstance(right, LoxArray) and len(left) != len(right):
+            raise RuntimeException(expr.operator, "Array operands must have the same length.")
+        if operation is operator.truediv and (0.0 in right.elements if isinstance(right, LoxArray) else right == 0):
+            raise RuntimeException(expr.operator, "Division by zero.")
+
+        if expr.operator.type in (TokenType.MINUS, TokenType.PLUS, TokenType.SLASH, TokenType.STAR):
+            return LoxArray(array("d", map(operation, *operands)))
+        return LoxArray(list(map(operation, *operands)))
 
     def visit_call_expr(self, expr: Call) -> object:
         callee = self.evaluate(expr.callee)
@@ -108,40 +270,108 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         for argument in expr.arguments:
             arguments.append(self.evaluate(argument))
 
+        self.check_call(expr, callee, arguments)
+        return callee.call(self, arguments)
+
+    def check_call(self, expr: Call, callee: object, arguments: list[object]):
         if not isinstance(callee, Callable):
             raise RuntimeException(expr.paren, "Can only call functions and classes.")
 
-        function = callee
-        if len(arguments) != function.arity():
+        arity = callee.arity()
+        if len(arguments) != arity:
             raise RuntimeException(
                 expr.paren,
-                "Expected {} arguments but got {}.".format(function.arity(), len(arguments))
+                "Expected {} arguments but got {}.".format(arity, len(arguments))
             )
-        return function.call(self, arguments)
+
+    def callback(self, callee: Callable) -> "types.FunctionType":
+        """
+        A Python function calling `callee`, for natives which call back into
+        Lox code. The arity of `callee` must have been checked.
+        """
+        if self.is_routine(callee):
+            run = self.stackless.run
+            routine = callee.routine
+            return lambda *arguments: run(routine(self, arguments))
+        return lambda *arguments: callee.call(self, list(arguments))
+
+    def is_routine(self, callee: Callable) -> bool:
+        return isinstance(callee, (LoxFunction, LoxClass, Memoized))
 
     def visit_index_expr(self, expr: Index) -> object:
         objekt = self.evaluate(expr.objekt)
         index = self.evaluate(expr.index)
-        if not isinstance(index, float):
-            raise RuntimeException(expr.bracket, "Index must be a number.")
+        return self.index_value(expr, objekt, index)
 
-        if isinstance(objekt, LoxArray):
-            return objekt.get(clean_index(index, len(objekt.elements)))
-        elif isinstance(objekt, str):
-            return objekt[clean_index(index, len(objekt))]
+    def index_value(self, expr: Index, objekt: object, index: object) -> object:
+        self.check_index(expr, objekt, index)
 
-        raise RuntimeException(expr.bracket, "Can only index arrays and strings.")
+        if isinstance(objekt, (LoxArray, LoxBytes)):
+            return objekt.get(clean_index(index, len(objekt)))
+        elif isinstance(objekt, (str, LoxMappedString)):
+            return objekt[clean_index(index, len(objekt))]
+        elif isinstance(objekt, LoxStringBuilder):
+            return objekt.build()[clean_index(index, len(objekt))]
+        elif isinstance(objekt, LoxMap):
+            if index not in objekt:
+                raise RuntimeException(expr.bracket, "Undefined key '{}'.".format(stringify(index)))
+            return objekt.get(index)
+        elif isinstance(objekt, LoxSet):
+            return index in objekt
+
+        raise RuntimeException(expr.bracket, "Can only index arrays, bytes, strings, string builders, maps and sets.")
+
+    def visit_hashmap_expr(self, expr: HashMap) -> object:
+        keys = []
+        values = []
+        for key, value in zip(expr.keys, expr.values):
+            keys.append(self.evaluate(key))
+            values.append(self.evaluate(value))
+        return self.new_map(expr, keys, values)
+
+    def new_map(self, expr: HashMap, keys: list[object], values: list[object]) -> LoxMap:
+        hash_map = LoxMap()
+        for key, value in zip(keys, values):
+            self.check_key(expr.brace, key)
+            hash_map.set(key, value)
+        return hash_map
+
+    def visit_hashset_expr(self, expr: HashSet) -> object:
+        return self.new_set(expr, [self.evaluate(element) for element in expr.elements])
+
+    def new_set(self, expr: HashSet, elements: list[object]) -> LoxSet:
+        hash_set = LoxSet()
+        for element in elements:
+            self.check_key(expr.brace, element)
+            hash_set.add(element)
+        return hash_set
+
+    def check_key(self, token: Token, key: object):
+        if not is_key(key):
+            raise RuntimeException(token, "Keys must be numbers, strings, booleans, nil or instances.")
 
     def visit_get_expr(self, expr: Get) -> object:
-        objekt = self.evaluate(expr.objekt)
+        res = self.get_property(expr, self.evaluate(expr.objekt))
+        if self.is_getter(res):
+            return res.call(self, ())
+        return res
+
+    def get_property(self, expr: Get, objekt: object) -> object:
         if isinstance(objekt, Instance):
+            if objekt.shape is None:
+                if expr.name.lexeme in objekt.values:
+                    return objekt.values[expr.name.lexeme]
+            else:
+                slot = objekt.shape.slots.get(expr.name.lexeme)
+                if slot is not None:
+                    return objekt.values[slot]
             try:
-                res = objekt.get(expr.name)
-            except RuntimeException:
-                raise RuntimeException(expr.name, "Undefined property '{}'.".format(expr.name.lexeme))
-            if isinstance(res, LoxFunction) and res.is_getter:
-                res = res.call(self, ())
-            return res
+                cache = expr.cache
+            except AttributeError:
+                cache = self.inline_cache(expr)
+            res = cache.find_method(objekt.klass)
+            if res is not None:
+                return res.bind(objekt)
         elif isinstance(objekt, LoxClass):
             res = objekt.find_class_method(expr.name.lexeme, recurse=True)
         else:
@@ -151,11 +381,41 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
             raise RuntimeException(expr.name, "Undefined property '{}'.".format(expr.name.lexeme))
         return res
 
+    def invoked_method(self, expr: Get, objekt: object) -> LoxFunction:
+        """
+        The method called by `objekt.name(...)`, when it can be invoked on
+        `objekt` without binding it first.
+        """
+        if type(objekt) is Instance and not objekt.has_field(expr.name.lexeme):
+            try:
+                cache = expr.cache
+            except AttributeError:
+                cache = self.inline_cache(expr)
+            method = cache.find_method(objekt.klass)
+            if method is not None and not method.is_getter:
+                return method
+        return None
+
+    def inline_cache(self, expr: Get) -> InlineCache:
+        """
+        Creates the cache of a site the first time it looks up a method. It
+        is kept on the node, and listed for cachestats() with the caches of
+        field assignments.
+        """
+        cache = expr.cache = InlineCache(expr.name.lexeme)
+        self.inline_caches.append(cache)
+        return cache
+
+    def is_getter(self, res: object) -> bool:
+        return isinstance(res, LoxFunction) and res.is_getter
+
     def visit_grouping_expr(self, expr: Grouping) -> object:
         return self.evaluate(expr.expression)
 
     def visit_lambda_expr(self, expr: Lambda) -> object:
-        stmt = Function(None, expr.params, expr.body)
+        stmt = self.lambdas.get(expr)
+        if stmt is None:
+            stmt = self.lambdas[expr] = Function(None, expr.params, expr.body)
         function = LoxFunction(stmt, self.environment)
         return function
 
@@ -165,35 +425,81 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     def visit_logical_expr(self, expr: Logical) -> object:
         left = self.evaluate(expr.left)
 
-        if expr.operator.type == TokenType.OR:
-            if self.is_truthy(left):
-                return left
-        else:
-            if not self.is_truthy(left):
-                return left
+        if self.short_circuits(expr, left):
+            return left
 
         return self.evaluate(expr.right)
 
+    def short_circuits(self, expr: Logical, left: object) -> bool:
+        if expr.operator.type == TokenType.OR:
+            return self.is_truthy(left)
+        return not self.is_truthy(left)
+
     def visit_set_expr(self, expr: Set) -> object:
         objekt = self.evaluate(expr.objekt)
+        self.check_fields(expr, objekt)
+
+        value = self.evaluate(expr.value)
+        self.set_property(expr, objekt, value)
+
+    def set_property(self, expr: Set, objekt: Instance, value: object):
+        try:
+            cache = expr.cache
+        except AttributeError:
+            cache = self.field_cache(expr)
+        # Assignments to a field the instance already has are the common
+        # case, and skip the call into the cache.
+        if objekt.shape is cache.shape and cache.slot is not None:
+            cache.hits += 1
+            objekt.values[cache.slot] = value
+        else:
+            cache.set(objekt, expr.name, value)
 
+    def field_cache(self, expr: Set) -> FieldCache:
+        cache = expr.cache = FieldCache()
+        self.inline_caches.append(cache)
+        return cache
+
+    def check_fields(self, expr: Set, objekt: object):
         if not isinstance(objekt, Instance):
             raise RuntimeException(expr.name, "Only instances have fields.")
 
-        value = self.evaluate(expr.value)
-        objekt.set(expr.name, value)
-
     def visit_setarray_expr(self, expr: SetArray) -> object:
         objekt = self.evaluate(expr.objekt)
-
-        if not isinstance(objekt, LoxArray):
-            raise RuntimeException(expr.bracket, "Can only index array.")
+        self.check_array(expr, objekt)
 
         index = self.evaluate(expr.index)
-        if not isinstance(index, float):
-            raise RuntimeException(expr.bracket, "Index must be a number.")
+        self.check_index(expr, objekt, index)
         value = self.evaluate(expr.value)
-        objekt.set(clean_index(index, len(objekt.elements)), value)
+        self.set_element(expr, objekt, index, value)
+
+    def check_array(self, expr: SetArray, objekt: object):
+        if not isinstance(objekt, (LoxArray, LoxBytes, LoxMap, LoxSet)):
+            raise RuntimeException(expr.bracket, "Can only index arrays, bytes, maps and sets.")
+
+    def check_index(self, expr: [Index, SetArray], objekt: object, index: object):
+        if isinstance(objekt, (LoxMap, LoxSet)):
+            self.check_key(expr.bracket, index)
+        elif not isinstance(index, float):
+            raise RuntimeException(expr.bracket, "Index must be a number.")
+
+    def set_element(self, expr: SetArray, objekt: [LoxArray, LoxBytes, LoxMap, LoxSet], index: object, value: object):
+        """
+        Storing a truthy value at an index of a set adds the index to the set,
+        storing a falsey one removes it.
+        """
+        if isinstance(objekt, LoxArray):
+            objekt.set(clean_index(index, len(objekt)), value)
+        elif isinstance(objekt, LoxBytes):
+            if not is_byte(value):
+                raise RuntimeException(expr.bracket, "Byte must be an integer from 0 to 255.")
+            objekt.set(clean_index(index, len(objekt)), value)
+        elif isinstance(objekt, LoxMap):
+            objekt.set(index, value)
+        elif self.is_truthy(value):
+            objekt.add(index)
+        else:
+            objekt.remove(index)
 
     def visit_ternary_expr(self, expr: Ternary) -> object:
         conditional = self.evaluate(expr.conditional)
@@ -205,8 +511,9 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         return self.lookup_variable(expr.keyword, expr)
 
     def visit_unary_expr(self, expr: Unary) -> object:
-        right = self.evaluate(expr.right)
+        return self.unary_operation(expr, self.evaluate(expr.right))
 
+    def unary_operation(self, expr: Unary, right: object) -> object:
         if expr.operator.type == TokenType.BANG:
             return not self.is_truthy(right)
         elif expr.operator.type == TokenType.MINUS:
@@ -277,7 +584,7 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     def visit_expression_stmt(self, stmt: Expression):
         value = self.evaluate(stmt.expression)
         if self.is_repl:
-            print(stringify(value))
+            self.output.print(value)
 
     def visit_function_stmt(self, stmt: Function):
         function = LoxFunction(stmt, self.environment)
@@ -293,12 +600,34 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     def visit_import_stmt(self, stmt: Import):
         if not os.path.exists(stmt.filename.lexeme):
             raise RuntimeException(stmt.filename, "Imported filename cannot be found.")
-        with open(stmt.filename.lexeme) as imported_file:
+        self.import_module(stmt.filename.lexeme)
+
+    def import_module(self, filename: str, reload: bool = False):
+        """
+        Runs an imported file once, unless it has been modified since or
+        `reload` is set. Files are told apart by their canonical path and are
+        registered before they run, so that cyclic imports stop. The
+        statements of files parsed ahead of time are used while the files
+        are unchanged.
+        """
+        path = os.path.realpath(filename)
+        modified = os.stat(path).st_mtime_ns
+        if not reload and self.modules.get(path) == modified:
+            return
+        self.modules[path] = modified
+        # Errors in the file are reported on stderr, after what was printed.
+        self.flush()
+
+        parsed, data = self.parsed.pop(path, (None, None))
+        if parsed == modified:
+            self.reporter.run_statements(load_statements(data), self)
+            return
+        with open(path) as imported_file:
             self.reporter.run(imported_file.read(), self)
 
     def visit_print_stmt(self, stmt: Print):
         value = self.evaluate(stmt.expression)
-        print(stringify(value))
+        self.output.print(value)
 
     def visit_return_stmt(self, stmt: Return):
         value = None
@@ -322,7 +651,10 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
                 return
 
     def execute(self, stmt: Stmt):
-        stmt.accept(self)
+        if stmt in self.suspendable:
+            self.stackless.run(stmt.accept(self.stackless))
+        else:
+            stmt.accept(self)
 
     def execute_block(self, statements: list[Stmt], environment: Environment):
         previous = self.environment
@@ -335,6 +667,8 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
 
     def resolve(self, expr: Expr, depth: int):
         self.locals[expr] = depth
+        if not isinstance(expr, This):
+            self.local_names.add(expr.name.lexeme)
 
     def is_truthy(self, obj: object) -> bool:
         if obj is None:
@@ -350,8 +684,3 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         if isinstance(operand, float):
             return
         raise RuntimeException(operator, "Operand must be a number.")
-
-    def check_number_operands(self, operator: Token, left: object, right: object):
-        if isinstance(left, float) and isinstance(right, float):
-            return
-        raise RuntimeException(operator, "Operands must be numbers.")
@@ -1,12 +1,16 @@
+import argparse
 import sys
 
 from ast_printer import ASTPrinter
+from frontend import parse_imports
 from interpreter import Interpreter
 from parser import Parser
 from exception import NativeException, RuntimeException
 from resolver import Resolver
 from scanner import Scanner
 from lox_token import Token
+from stmt import Stmt
+from output import Output
 from token_type import TokenType
 
 
@@ -17,28 +21,44 @@ class Lox:
 
     @classmethod
     def main(cls):
-        if len(sys.argv) > 2:
-            print("Usage: pylox [script]")
-            exit(1)
-        elif len(sys.argv) == 2:
-            cls.run_file(sys.argv[1])
-        else:
-            cls.run_prompt()
+        parser = argparse.ArgumentParser(prog="pylox")
+        parser.add_argument("script", nargs="?")
+        parser.add_argument("--output", metavar="FILE", help="write printed values to FILE instead of stdout")
+        parser.add_argument("--buffer", metavar="SIZE", type=int, default=Output.size,
+                            help="characters of output and of each written file buffered before writing, 0 to write through")
+        parser.add_argument("--jobs", metavar="N", type=int, default=1,
+                            help="scan and parse the imported files ahead of time in N processes")
+        args = parser.parse_args()
+
+        output_file = open(args.output, "w") if args.output is not None else None
+        try:
+            if args.script is not None:
+                cls.run_file(args.script, Output(output_file, args.buffer), args.jobs)
+            else:
+                cls.run_prompt(Output(output_file, args.buffer))
+        finally:
+            if output_file is not None:
+                output_file.close()
 
     @classmethod
-    def run_file(cls, filename: str):
-        _interpreter = Interpreter(cls)
+    def run_file(cls, filename: str, output: Output = None, jobs: int = 1):
+        _interpreter = Interpreter(cls, output=output)
         with open(filename, 'r') as f:
             code = f.read()
-            cls.run(code, _interpreter)
+            if jobs > 1:
+                _interpreter.parsed = parse_imports(code, jobs)
+            try:
+                cls.run(code, _interpreter)
+            finally:
+                _interpreter.close()
         if cls.had_error:
             exit(65)
         if cls.had_runtime_error:
             exit(70)
 
     @classmethod
-    def run_prompt(cls):
-        _interpreter = Interpreter(cls, is_repl=True)
+    def run_prompt(cls, output: Output = None):
+        _interpreter = Interpreter(cls, is_repl=True, output=output)
         while True:
             try:
                 line = input("> ")
@@ -46,6 +66,7 @@ class Lox:
                 cls.had_error = False
             except EOFError:
                 break
+        _interpreter.close()
 
     @classmethod
     def run(cls, source: str, _interpreter: Interpreter):
@@ -58,6 +79,10 @@ class Lox:
         if cls.had_error:
             return
 
+        cls.run_statements(statements, _interpreter)
+
+    @classmethod
+    def run_statements(cls, statements: list[Stmt], _interpreter: Interpreter):
         resolver = Resolver(_interpreter)
         resolver.resolve_statements(statements)
 
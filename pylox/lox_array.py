@@ -0,0 +1,112 @@
+from array import array
+
+from util import stringify
+
+
+class LoxArray:
+    """
+    Elements are held in an `array("d")` while they are all numbers. `boxed`
+    counts the non-numbers of a list, or is None once a typed array has
+    become a list for good.
+    """
+
+    __slots__ = ("elements", "boxed")
+
+    def __init__(self, elements: [list[object], array]):
+        self.replace(elements)
+
+    def replace(self, elements: [list[object], array]):
+        """
+        Stores `elements`, which are not copied when they are a list or a typed
+        array.
+        """
+        if type(elements) is array:
+            self.boxed = 0
+            self.elements = elements
+            return
+
+        self.boxed = sum(1 for element in elements if type(element) is not float)
+        if self.boxed == 0:
+            self.elements = array("d", elements)
+        else:
+            self.elements = elements if type(elements) is list else list(elements)
+
+    def get(self, index: int) -> object:
+        return self.elements[index]
+
+    def set(self, index: int, value: object):
+        elements = self.elements
+        if type(elements) is array:
+            if type(value) is not float:
+                self.elements = elements = elements.tolist()
+                self.boxed = None
+        elif self.boxed is not None:
+            self.boxed += (type(value) is not float) - (type(elements[index]) is not float)
+            if self.boxed == 0:
+                elements[index] = value
+                self.elements = array("d", elements)
+                return
+        elements[index] = value
+
+    def is_typed(self) -> bool:
+        return type(self.elements) is array
+
+    def holds_numbers(self) -> bool:
+        if type(self.elements) is array:
+            return True
+        return all(type(element) is float for element in self.elements)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LoxArray):
+            if type(self.elements) is type(other.elements):
+                return self.elements == other.elements
+            return list(self.elements) == list(other.elements)
+        return False
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __str__(self) -> str:
+        return "[{}]".format(",".join([stringify(element) for element in self.elements]))
+
+
+class LoxArrayView(LoxArray):
+    """
+    A window on the elements of another array, sharing its storage.
+
+    `indexes` are the indexes of the viewed elements in `root`, the array
+    owning the storage, so views of views compose their ranges instead of
+    chaining lookups. Natives reading `elements` get a copy of the viewed
+    elements, and `replace` writes them back to the root.
+    """
+
+    __slots__ = ("root", "indexes")
+
+    def __init__(self, objekt: LoxArray, indexes: range):
+        if isinstance(objekt, LoxArrayView):
+            self.root = objekt.root
+            self.indexes = objekt.indexes[indexes.start:indexes.stop:indexes.step]
+        else:
+            self.root = objekt
+            self.indexes = indexes
+
+    @property
+    def elements(self) -> [list[object], array]:
+        indexes = self.indexes
+        return self.root.elements[indexes.start:indexes.stop:indexes.step]
+
+    def replace(self, elements: [list[object], array]):
+        for index, element in zip(self.indexes, elements):
+            self.root.set(index, element)
+
+    def get(self, index: int) -> object:
+        return self.root.elements[self.indexes[index]]
+
+    def set(self, index: int, value: object):
+        self.root.set(self.indexes[index], value)
+
+    def is_typed(self) -> bool:
+        return self.root.is_typed()
+
+    def __len__(self) -> int:
+        return len(self.indexes)
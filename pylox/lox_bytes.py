@@ -0,0 +1,49 @@
+from array import array
+
+
+def is_byte(value: object) -> bool:
+    return type(value) is float and value.is_integer() and 0 <= value <= 255
+
+
+class LoxBytes:
+    """
+    Binary data read and written as numbers from 0 to 255. The bytes are
+    held through a memoryview, so views share the storage of the bytes they
+    were made from.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: [bytes, bytearray, memoryview]):
+        if type(data) is bytes:
+            data = bytearray(data)
+        self.data = memoryview(data)
+
+    def get(self, index: int) -> float:
+        return float(self.data[index])
+
+    def set(self, index: int, value: float):
+        self.data[index] = int(value)
+
+    def view(self, indexes: slice) -> "LoxBytes":
+        return LoxBytes(self.data[indexes])
+
+    def copy(self, indexes: slice = slice(None)) -> "LoxBytes":
+        return LoxBytes(bytearray(self.data[indexes]))
+
+    def decode(self) -> str:
+        return self.data.tobytes().decode("latin-1")
+
+    def values(self) -> array:
+        return array("d", self.data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LoxBytes):
+            return self.data == other.data
+        return False
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __str__(self) -> str:
+        return "bytes[{}]".format(",".join(map(str, self.data)))
@@ -1,6 +1,9 @@
+from typing import Generator
+
 from function import LoxFunction
 from instance import Instance
 from lox_callable import Callable
+from shape import Shape
 
 
 class LoxClass(Callable):
@@ -12,45 +15,73 @@ class LoxClass(Callable):
         self.instance_methods = instance_methods
         self.getters = getters
 
+        # Classes can't be modified once created, so method resolution is
+        # done once here and lookups are a single dictionary probe.
+        self.bound_class_methods = {method_name: method.bind(self) for method_name, method in class_methods.items()}
+        self.methods = self.resolve_methods()
+        self.resolved_class_methods = self.resolve_class_methods()
+        self.shape = Shape(self)
+
+        # A subclass resolves its own initializer from its resolved methods,
+        # and redefining a class creates a new LoxClass, so this never goes
+        # stale.
+        self.initializer = self.methods.get("init")
+        self.initializer_arity = self.initializer.arity() if self.initializer is not None else 0
+
     def arity(self) -> int:
-        initializer = self.find_method("init")
-        if initializer is None:
-            return 0
-        return initializer.arity()
+        return self.initializer_arity
 
     def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        return interpreter.stackless.run(self.routine(interpreter, arguments))
+
+    def routine(self, interpreter: "Interpreter", arguments: list[object]) -> Generator:
         instance = Instance(self)
-        initializer = self.find_method("init")
-        if initializer is not None:
-            initializer.bind(instance).call(interpreter, arguments)
+        if self.initializer is not None:
+            yield from self.initializer.routine(interpreter, arguments, instance)
 
         return instance
 
+    def resolve_methods(self) -> dict[str, LoxFunction]:
+        # Superclasses take precedence over the class itself, the first one
+        # listed over the others.
+        methods = dict(self.bound_class_methods)
+        methods.update(self.instance_methods)
+        methods.update(self.getters)
+        for superclass in reversed(self.superclasses):
+            methods.update(superclass.methods)
+        return methods
+
+    def resolve_class_methods(self) -> dict[str, LoxFunction]:
+        class_methods = dict(self.bound_class_methods)
+        for superclass in reversed(self.superclasses):
+            class_methods.update(superclass.resolved_class_methods)
+        return class_methods
+
     def find_method(self, name: str, stop_at: "LoxClass" = None) -> LoxFunction:
+        if stop_at is None:
+            return self.methods.get(name)
+
         for superclass in self.superclasses:
             if superclass != stop_at:
-                res = superclass.find_method(name)
+                res = superclass.methods.get(name)
                 if res is not None:
                     return res
         if name in self.getters:
             return self.getters[name]
         if name in self.instance_methods:
             return self.instance_methods[name]
-        class_method = self.find_class_method(name, recurse=False)
-        if class_method is not None:
-            return class_method
-        return None
+        return self.bound_class_methods.get(name)
 
     def find_class_method(self, name: str, stop_at: "LoxClass" = None, recurse: bool = False) -> LoxFunction:
         if recurse:
+            if stop_at is None:
+                return self.resolved_class_methods.get(name)
             for superclass in self.superclasses:
                 if superclass != stop_at:
                     res = superclass.find_class_method(name, stop_at=stop_at, recurse=True)
                     if res is not None:
                         return res
-        if name in self.class_methods:
-            return self.class_methods[name].bind(self)
-        return None
+        return self.bound_class_methods.get(name)
 
     def __str__(self) -> str:
         return self.name
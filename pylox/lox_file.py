@@ -0,0 +1,96 @@
+import sys
+
+from output import Output
+
+
+class LoxFile:
+    """
+    A file opened by a script. Files opened for reading are read through
+    Python's buffered I/O, lines are returned without their line break and
+    None marks the end of the file. Files opened for writing or appending
+    buffer what is written in an Output of `size` characters, and replace
+    the characters Latin-1 cannot encode.
+    """
+
+    __slots__ = ("path", "mode", "file", "output")
+
+    def __init__(self, path: str, mode: str, size: int = None):
+        self.path = path
+        self.mode = mode
+        self.file = open(path, mode, encoding="latin-1", errors="strict" if mode == "r" else "replace")
+        self.output = Output(self.file, size) if mode != "r" else None
+
+    def is_open(self) -> bool:
+        return not self.file.closed
+
+    def is_readable(self) -> bool:
+        return self.output is None
+
+    def readline(self) -> [str, None]:
+        line = self.file.readline()
+        if line == "":
+            return None
+        return line[:-1] if line.endswith("\n") else line
+
+    def read(self, size: int) -> [str, None]:
+        chunk = self.file.read(size)
+        return chunk if chunk != "" else None
+
+    def lines(self) -> "typing.Iterator[str]":
+        for line in self.file:
+            yield line[:-1] if line.endswith("\n") else line
+
+    def write(self, value: object):
+        self.output.write_value(value)
+
+    def flush(self):
+        if self.output is not None and self.is_open():
+            self.output.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __str__(self) -> str:
+        return "<file {}>".format(self.path)
+
+
+class LoxStdin(LoxFile):
+    """
+    The standard input, read through the current `sys.stdin` so that it
+    shares its buffer with the input() of the REPL. When it is a terminal,
+    `output` is flushed before each read so that prompts are shown. Closing
+    it leaves `sys.stdin` open.
+    """
+
+    __slots__ = ("prompts",)
+
+    def __init__(self, output: Output):
+        self.path = "stdin"
+        self.mode = "r"
+        self.output = None
+        self.prompts = output
+
+    @property
+    def file(self) -> "typing.TextIO":
+        return sys.stdin
+
+    def readline(self) -> [str, None]:
+        self.prompt()
+        return super().readline()
+
+    def read(self, size: int) -> [str, None]:
+        self.prompt()
+        return super().read(size)
+
+    def lines(self) -> "typing.Iterator[str]":
+        if self.file.isatty():
+            return iter(self.readline, None)
+        return super().lines()
+
+    def prompt(self):
+        if self.file.isatty():
+            self.prompts.flush()
+
+    def close(self):
+        pass
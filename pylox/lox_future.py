@@ -0,0 +1,33 @@
+import asyncio
+
+
+def read_text(filename: str) -> str:
+    with open(filename, encoding="latin-1") as f:
+        return f.read()
+
+
+def write_text(filename: str, text: str):
+    with open(filename, "w", encoding="latin-1") as f:
+        f.write(text)
+
+
+async def run_command(command: str) -> str:
+    process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE)
+    output, _ = await process.communicate()
+    return output.decode("latin-1")
+
+
+class LoxFuture:
+    """
+    The result of an I/O operation running on the event loop of the
+    interpreter. The loop only runs while a script waits for a result, and
+    then advances every pending operation, not just the awaited one.
+    """
+
+    __slots__ = ("future",)
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+
+    def __str__(self) -> str:
+        return "<future done>" if self.future.done() else "<future>"
@@ -0,0 +1,96 @@
+from instance import Instance
+from util import stringify
+
+
+def is_key(value: object) -> bool:
+    return type(value) in (float, str, bool, type(None), Instance)
+
+
+def to_key(value: object) -> object:
+    # Booleans are tagged so that true and 1 are different keys.
+    if type(value) is bool:
+        return (bool, value)
+    return value
+
+
+def from_key(key: object) -> object:
+    if type(key) is tuple:
+        return key[1]
+    return key
+
+
+class LoxMap:
+    """
+    Keys are numbers, strings, booleans, nil or instances, which are compared
+    by identity.
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self):
+        self.entries = dict()
+
+    def get(self, key: object) -> object:
+        return self.entries[to_key(key)]
+
+    def set(self, key: object, value: object):
+        self.entries[to_key(key)] = value
+
+    def remove(self, key: object):
+        self.entries.pop(to_key(key), None)
+
+    def keys(self) -> list[object]:
+        return [from_key(key) for key in self.entries]
+
+    def values(self) -> list[object]:
+        return list(self.entries.values())
+
+    def __contains__(self, key: object) -> bool:
+        return to_key(key) in self.entries
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LoxMap):
+            return self.entries == other.entries
+        return False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __str__(self) -> str:
+        return "{{{}}}".format(",".join(["{}:{}".format(stringify(from_key(key)), stringify(value)) for key, value in self.entries.items()]))
+
+
+class LoxSet:
+    """
+    Elements are numbers, strings, booleans, nil or instances, which are
+    compared by identity. They are the keys of a dictionary rather than a set
+    so that they are iterated in insertion order.
+    """
+
+    __slots__ = ("elements",)
+
+    def __init__(self):
+        self.elements = dict()
+
+    def add(self, element: object):
+        self.elements[to_key(element)] = None
+
+    def remove(self, element: object):
+        self.elements.pop(to_key(element), None)
+
+    def keys(self) -> list[object]:
+        return [from_key(key) for key in self.elements]
+
+    def __contains__(self, element: object) -> bool:
+        return to_key(element) in self.elements
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LoxSet):
+            return self.elements.keys() == other.elements.keys()
+        return False
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __str__(self) -> str:
+        return "{{{}}}".format(",".join([stringify(from_key(key)) for key in self.elements]))
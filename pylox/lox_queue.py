@@ -0,0 +1,63 @@
+import heapq
+from collections import deque
+from itertools import count
+
+from util import stringify
+
+
+class LoxHeap:
+    """
+    A priority queue popping its smallest element first, or the element
+    with the smallest key when `key` is given. Elements of equal priority
+    are popped in insertion order.
+    """
+
+    __slots__ = ("key", "entries", "counter")
+
+    def __init__(self, key: "types.FunctionType" = None):
+        self.key = key
+        # Entries are (priority, insertion number, element) so that elements
+        # themselves are never compared.
+        self.entries = []
+        self.counter = count()
+
+    def push(self, element: object):
+        """
+        Raises TypeError when the priority isn't a number or string of the
+        same type as the other priorities.
+        """
+        priority = element if self.key is None else self.key(element)
+        if type(priority) not in (float, str) or (self.entries and type(priority) is not type(self.entries[0][0])):
+            raise TypeError(priority)
+        heapq.heappush(self.entries, (priority, next(self.counter), element))
+
+    def pop(self) -> object:
+        return heapq.heappop(self.entries)[2]
+
+    def peek(self) -> object:
+        return self.entries[0][2]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __str__(self) -> str:
+        return "heap[{}]".format(",".join([stringify(entry[2]) for entry in sorted(self.entries)]))
+
+
+class LoxDeque:
+    """
+    A double-ended queue. With a `capacity` it is a ring buffer: pushing on
+    one end of a full one drops the element at the other end.
+    """
+
+    __slots__ = ("elements",)
+
+    def __init__(self, capacity: int = None):
+        self.elements = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __str__(self) -> str:
+        name = "deque" if self.elements.maxlen is None else "ring"
+        return "{}[{}]".format(name, ",".join([stringify(element) for element in self.elements]))
@@ -0,0 +1,75 @@
+import mmap
+
+
+class LoxStringBuilder:
+    """
+    A string built by appending pieces, which are only joined when the whole
+    string is needed and then kept joined until the next append.
+    """
+
+    __slots__ = ("parts", "length")
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def append(self, text: str):
+        self.parts.append(text)
+        self.length += len(text)
+
+    def build(self) -> str:
+        if len(self.parts) != 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __str__(self) -> str:
+        return self.build()
+
+
+class LoxMappedString:
+    """
+    A read-only string of the Latin-1 characters of a file mapped into
+    memory. Indexing, slicing and searching only decode the characters they
+    touch, so only the pages holding those are read from the file.
+    """
+
+    __slots__ = ("path", "data")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            # An empty file cannot be mapped.
+            try:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self.data = b""
+
+    def find(self, needle: str) -> int:
+        try:
+            return self.data.find(needle.encode("latin-1"))
+        except UnicodeEncodeError:
+            return -1
+
+    def __getitem__(self, index: [int, slice]) -> str:
+        if isinstance(index, slice):
+            return self.data[index].decode("latin-1")
+        return chr(self.data[index])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LoxMappedString):
+            return len(self.data) == len(other.data) and self.data[:] == other.data[:]
+        if isinstance(other, str):
+            try:
+                return len(self.data) == len(other) and self.data[:] == other.encode("latin-1")
+            except UnicodeEncodeError:
+                return False
+        return False
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __str__(self) -> str:
+        return self.data[:].decode("latin-1")
@@ -1,13 +1,48 @@
+import asyncio
+import bisect
+import functools
+import math
+import operator
 import os.path
 import time
+from collections import OrderedDict
+from typing import Generator
 
-from array import LoxArray
+from lox_array import LoxArray, LoxArrayView
+from lox_bytes import LoxBytes, is_byte
+from lox_file import LoxFile
+from lox_future import LoxFuture, read_text, run_command, write_text
+from lox_map import LoxMap, LoxSet, is_key
+from lox_queue import LoxDeque, LoxHeap
+from lox_string import LoxMappedString, LoxStringBuilder
+from util import stringify
+from function import LoxFunction
 from instance import Instance
 from lox_callable import Callable
 from lox_class import LoxClass
 from exception import NativeException
 
 
+class Append(Callable):
+    """
+    Appends a value to a string builder, as printed.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        builder, value = arguments
+
+        if not isinstance(builder, LoxStringBuilder):
+            raise NativeException("append: First argument must be a string builder.")
+
+        builder.append(value if isinstance(value, str) else stringify(value))
+
+    def __str__(self) -> str:
+        return "<native fn: append>"
+
+
 class ArrayCallable(Callable):
 
     def arity(self) -> int:
@@ -23,6 +58,130 @@ class ArrayCallable(Callable):
         return "<native fn: array>"
 
 
+class Await(Callable):
+    """
+    The result of a future, running the event loop until it is done.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        future = arguments[0]
+
+        if not isinstance(future, LoxFuture):
+            raise NativeException("await: Argument must be a future.")
+
+        try:
+            return interpreter.event_loop().run_until_complete(future.future)
+        except OSError as error:
+            raise NativeException("await: {}.".format(error.strerror))
+
+    def __str__(self) -> str:
+        return "<native fn: await>"
+
+
+class Bisect(Callable):
+    """
+    The index where a value would be inserted in a sorted array, before any
+    equal elements.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, value = arguments
+
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("bisect: First argument must be an array.")
+
+        try:
+            return float(bisect.bisect_left(objekt.elements, value))
+        except TypeError:
+            raise NativeException("bisect: Can only search numbers or strings.")
+
+    def __str__(self) -> str:
+        return "<native fn: bisect>"
+
+
+class Build(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        builder = arguments[0]
+
+        if not isinstance(builder, LoxStringBuilder):
+            raise NativeException("build: Argument must be a string builder.")
+
+        return builder.build()
+
+    def __str__(self) -> str:
+        return "<native fn: build>"
+
+
+class BuilderCallable(Callable):
+
+    def arity(self) -> int:
+        return 0
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        return LoxStringBuilder()
+
+    def __str__(self) -> str:
+        return "<native fn: builder>"
+
+
+class BytesCallable(Callable):
+    """
+    Bytes holding `size` zeros, the Latin-1 encoding of a string, the numbers
+    of an array, or a copy of other bytes.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        value = arguments[0]
+
+        if isinstance(value, float) and value.is_integer() and value >= 0:
+            return LoxBytes(bytearray(int(value)))
+        elif isinstance(value, str):
+            try:
+                return LoxBytes(value.encode("latin-1"))
+            except UnicodeEncodeError:
+                raise NativeException("bytes: Invalid character set. Can only handle ASCII.")
+        elif isinstance(value, LoxArray):
+            if not all(is_byte(element) for element in value.elements):
+                raise NativeException("bytes: Array elements must be integers from 0 to 255.")
+            return LoxBytes(bytearray(map(int, value.elements)))
+        elif isinstance(value, LoxBytes):
+            return value.copy()
+
+        raise NativeException("bytes: Argument must be a size, string, array or bytes.")
+
+    def __str__(self) -> str:
+        return "<native fn: bytes>"
+
+
+class CacheStats(Callable):
+
+    def arity(self) -> int:
+        return 0
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        caches = interpreter.inline_caches
+        hits = sum(cache.hits for cache in caches)
+        misses = sum(cache.misses for cache in caches)
+        megamorphic = sum(1 for cache in caches if cache.is_megamorphic())
+        return LoxArray([float(hits), float(misses), float(len(caches)), float(megamorphic)])
+
+    def __str__(self) -> str:
+        return "<native fn: cachestats>"
+
+
 class Char(Callable):
 
     def arity(self) -> int:
@@ -52,6 +211,278 @@ class Clock(Callable):
         return "<native fn: clock>"
 
 
+class Close(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle = arguments[0]
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("close: Argument must be a file.")
+
+        handle.close()
+        interpreter.files.discard(handle)
+
+    def __str__(self) -> str:
+        return "<native fn: close>"
+
+
+class Concat(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        first, second = arguments
+
+        if not isinstance(first, LoxArray) or not isinstance(second, LoxArray):
+            raise NativeException("concat: Arguments must be arrays.")
+
+        if first.is_typed() and second.is_typed():
+            return LoxArray(first.elements + second.elements)
+        return LoxArray([*first.elements, *second.elements])
+
+    def __str__(self) -> str:
+        return "<native fn: concat>"
+
+
+class Copy(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if isinstance(objekt, LoxBytes):
+            return objekt.copy()
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("copy: Argument must be an array or bytes.")
+
+        return LoxArray(objekt.elements[:])
+
+    def __str__(self) -> str:
+        return "<native fn: copy>"
+
+
+class Decode(Callable):
+    """
+    The string of the Latin-1 characters of bytes.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxBytes):
+            raise NativeException("decode: Argument must be bytes.")
+
+        return objekt.decode()
+
+    def __str__(self) -> str:
+        return "<native fn: decode>"
+
+
+class DeleteFile(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename = arguments[0]
+
+        if not isinstance(filename, str):
+            raise NativeException("deletefile: Argument must be a string.")
+
+        if not os.path.exists(filename):
+            raise NativeException("deletefile: File cannot be found.")
+
+        try:
+            os.remove(filename)
+        except OSError:
+            raise NativeException("deletefile: File cannot be deleted.")
+
+    def __str__(self) -> str:
+        return "<native fn: deletefile>"
+
+
+class DequeCallable(Callable):
+
+    def arity(self) -> int:
+        return 0
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        return LoxDeque()
+
+    def __str__(self) -> str:
+        return "<native fn: deque>"
+
+
+class Dot(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        first, second = arguments
+
+        if not isinstance(first, LoxArray) or not isinstance(second, LoxArray):
+            raise NativeException("dot: Arguments must be arrays.")
+        if not first.holds_numbers() or not second.holds_numbers():
+            raise NativeException("dot: Arrays must only hold numbers.")
+        if len(first) != len(second):
+            raise NativeException("dot: Arrays must have the same length.")
+
+        return float(sum(map(operator.mul, first.elements, second.elements)))
+
+    def __str__(self) -> str:
+        return "<native fn: dot>"
+
+
+class EachLine(Callable):
+    """
+    Calls `function` with each remaining line of a file, reading one buffered
+    line at a time.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle, function = arguments
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("eachline: First argument must be a file.")
+        if not handle.is_open():
+            raise NativeException("eachline: File is closed.")
+        if not handle.is_readable():
+            raise NativeException("eachline: File is not open for reading.")
+        if not isinstance(function, Callable) or function.arity() != 1:
+            raise NativeException("eachline: Second argument must be a function of one argument.")
+
+        callback = interpreter.callback(function)
+        for line in handle.lines():
+            callback(line)
+
+    def __str__(self) -> str:
+        return "<native fn: eachline>"
+
+
+class Fill(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, value = arguments
+
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("fill: First argument must be an array.")
+
+        objekt.replace([value] * len(objekt))
+
+    def __str__(self) -> str:
+        return "<native fn: fill>"
+
+
+class Find(Callable):
+    """
+    The index of the first occurrence of `needle` in a string, or -1.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text, needle = arguments
+
+        if not isinstance(text, (str, LoxMappedString)) or not isinstance(needle, str):
+            raise NativeException("find: Arguments must be strings.")
+
+        return float(text.find(needle))
+
+    def __str__(self) -> str:
+        return "<native fn: find>"
+
+
+class Flush(Callable):
+    """
+    Writes what is buffered for a file opened for writing or appending.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle = arguments[0]
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("flush: Argument must be a file.")
+        if not handle.is_open():
+            raise NativeException("flush: File is closed.")
+
+        handle.flush()
+
+    def __str__(self) -> str:
+        return "<native fn: flush>"
+
+
+class Gather(Callable):
+    """
+    The results of an array of futures, running the event loop until they
+    are all done.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxArray) or not all(isinstance(element, LoxFuture) for element in objekt.elements):
+            raise NativeException("gather: Argument must be an array of futures.")
+
+        # Gathering nothing would not be bound to the loop of the interpreter.
+        if len(objekt) == 0:
+            return LoxArray([])
+
+        loop = interpreter.event_loop()
+        try:
+            return LoxArray(loop.run_until_complete(asyncio.gather(*[element.future for element in objekt.elements])))
+        except OSError as error:
+            raise NativeException("gather: {}.".format(error.strerror))
+
+    def __str__(self) -> str:
+        return "<native fn: gather>"
+
+
+class HeapCallable(Callable):
+    """
+    An empty heap, ordered by the elements themselves when `key` is nil or by
+    the value of `key(element)`, called once per push.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        key = arguments[0]
+
+        if key is None:
+            return LoxHeap()
+        if not isinstance(key, Callable) or key.arity() != 1:
+            raise NativeException("heap: Argument must be a function of one argument or nil.")
+
+        return LoxHeap(interpreter.callback(key))
+
+    def __str__(self) -> str:
+        return "<native fn: heap>"
+
+
 class Inner(Callable):
 
     def arity(self) -> int:
@@ -99,57 +530,998 @@ class Int(Callable):
         return "<native fn: int>"
 
 
-class Length(Callable):
+class Join(Callable):
+    """
+    The elements of an array, as printed, separated by `separator`.
+    """
 
     def arity(self) -> int:
-        return 1
+        return 2
 
     def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
-        objekt = arguments[0]
+        objekt, separator = arguments
 
-        if objekt.__class__.__name__ != "LoxArray" and not isinstance(objekt, str):
-            raise NativeException("len: Argument must be array or string.")
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("join: First argument must be an array.")
+        if not isinstance(separator, str):
+            raise NativeException("join: Second argument must be a string.")
 
-        return float(len(objekt))
+        return separator.join([element if isinstance(element, str) else stringify(element) for element in objekt.elements])
 
     def __str__(self) -> str:
-        return "<native fn: len>"
+        return "<native fn: join>"
 
 
-class NoOp(Callable):
+class Keys(Callable):
+    """
+    The keys of a map or the elements of a set, in insertion order.
+    """
 
     def arity(self) -> int:
-        class AlwaysEq:
-            def __eq__(self, other: object) -> bool:
-                return True
-        return AlwaysEq()
+        return 1
 
     def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
-        return None
+        objekt = arguments[0]
+
+        if not isinstance(objekt, (LoxMap, LoxSet)):
+            raise NativeException("keys: Argument must be a map or set.")
+
+        return LoxArray(objekt.keys())
 
     def __str__(self) -> str:
-        return "<native fn: noop>"
+        return "<native fn: keys>"
 
 
-class ReadFile(Callable):
+class Length(Callable):
 
     def arity(self) -> int:
         return 1
 
     def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
-        filename = arguments[0]
-
-        if not isinstance(filename, str):
-            raise NativeException("readfile: Argument must be a string.")
+        objekt = arguments[0]
 
-        if not os.path.exists(filename):
-            raise NativeException("readfile: File cannot be found.")
+        if not isinstance(objekt, (LoxArray, LoxBytes, LoxDeque, LoxHeap, LoxMap, LoxMappedString, LoxSet, LoxStringBuilder, str)):
+            raise NativeException("len: Argument must be array, bytes, deque, heap, map, mapped file, set, string or string builder.")
 
-        with open(filename, encoding="latin-1") as f:
-            return f.read()
+        return float(len(objekt))
 
     def __str__(self) -> str:
-        return "<native fn: readfile>"
+        return "<native fn: len>"
+
+
+class Lower(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text = arguments[0]
+
+        if not isinstance(text, str):
+            raise NativeException("lower: Argument must be a string.")
+
+        return text.lower()
+
+    def __str__(self) -> str:
+        return "<native fn: lower>"
+
+
+class MapFile(Callable):
+    """
+    The contents of a file as a read-only string which is read lazily from
+    a memory mapping of the file.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename = arguments[0]
+
+        if not isinstance(filename, str):
+            raise NativeException("mapfile: Argument must be a string.")
+
+        if not os.path.exists(filename):
+            raise NativeException("mapfile: File cannot be found.")
+
+        try:
+            return LoxMappedString(filename)
+        except OSError:
+            raise NativeException("mapfile: File cannot be opened.")
+
+    def __str__(self) -> str:
+        return "<native fn: mapfile>"
+
+
+class Max(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxArray) or not objekt.holds_numbers():
+            raise NativeException("max: Argument must be an array of numbers.")
+        if len(objekt) == 0:
+            raise NativeException("max: Array must not be empty.")
+
+        return max(objekt.elements)
+
+    def __str__(self) -> str:
+        return "<native fn: max>"
+
+
+class Memoize(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        function, maxsize = arguments
+
+        if not isinstance(function, (LoxFunction, LoxClass)):
+            raise NativeException("memoize: First argument must be a function or class.")
+        if maxsize is not None and (not isinstance(maxsize, float) or not maxsize.is_integer() or maxsize < 0):
+            raise NativeException("memoize: Second argument must be a non-negative integer or nil.")
+
+        return Memoized(function, None if maxsize is None else int(maxsize))
+
+    def __str__(self) -> str:
+        return "<native fn: memoize>"
+
+
+class Memoized(Callable):
+    """
+    Caches the results of a function or class by argument values.
+
+    Only calls whose arguments are all numbers, strings, booleans or nil are
+    cached, other calls go straight to the function. Once `maxsize` results
+    are cached, the least recently used one is evicted.
+    """
+
+    cacheable = (float, str, bool, type(None))
+
+    def __init__(self, function: [LoxFunction, LoxClass], maxsize: int):
+        self.function = function
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def arity(self) -> int:
+        return self.function.arity()
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        return interpreter.stackless.run(self.routine(interpreter, arguments))
+
+    def routine(self, interpreter: "Interpreter", arguments: list[object]) -> Generator:
+        for argument in arguments:
+            if not isinstance(argument, self.cacheable):
+                return (yield self.function.routine(interpreter, arguments))
+
+        # Tagged with the types so that true and 1 are different keys.
+        key = tuple((argument.__class__, argument) for argument in arguments)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        self.misses += 1
+        value = yield self.function.routine(interpreter, arguments)
+        if self.maxsize != 0:
+            self.cache[key] = value
+            if self.maxsize is not None and len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+        return value
+
+    def __str__(self) -> str:
+        return "<memoized {}>".format(self.function)
+
+
+class MemoStats(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        memoized = arguments[0]
+
+        if not isinstance(memoized, Memoized):
+            raise NativeException("memostats: Argument must be a memoized function.")
+
+        maxsize = None if memoized.maxsize is None else float(memoized.maxsize)
+        return LoxArray([float(memoized.hits), float(memoized.misses), float(len(memoized.cache)), maxsize])
+
+    def __str__(self) -> str:
+        return "<native fn: memostats>"
+
+
+class Min(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxArray) or not objekt.holds_numbers():
+            raise NativeException("min: Argument must be an array of numbers.")
+        if len(objekt) == 0:
+            raise NativeException("min: Array must not be empty.")
+
+        return min(objekt.elements)
+
+    def __str__(self) -> str:
+        return "<native fn: min>"
+
+
+class NoOp(Callable):
+
+    def arity(self) -> int:
+        class AlwaysEq:
+            def __eq__(self, other: object) -> bool:
+                return True
+        return AlwaysEq()
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        return None
+
+    def __str__(self) -> str:
+        return "<native fn: noop>"
+
+
+class Number(Callable):
+    """
+    The number written in a string, ignoring surrounding whitespace, or nil.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text = arguments[0]
+
+        if not isinstance(text, str):
+            raise NativeException("number: Argument must be a string.")
+
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+        return number if math.isfinite(number) else None
+
+    def __str__(self) -> str:
+        return "<native fn: number>"
+
+
+class Open(Callable):
+    """
+    Opens a file for reading with mode "r", or for writing with mode "w" or
+    appending with mode "a". It stays open until it is closed or the
+    interpreter exits. Writes are buffered like printed values.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename, mode = arguments
+
+        if not isinstance(filename, str):
+            raise NativeException("open: First argument must be a string.")
+        if mode not in ("r", "w", "a"):
+            raise NativeException("open: Second argument must be \"r\", \"w\" or \"a\".")
+
+        if mode == "r" and not os.path.exists(filename):
+            raise NativeException("open: File cannot be found.")
+
+        try:
+            handle = LoxFile(filename, mode, interpreter.output.size)
+        except OSError:
+            raise NativeException("open: File cannot be opened.")
+        interpreter.files.add(handle)
+        return handle
+
+    def __str__(self) -> str:
+        return "<native fn: open>"
+
+
+class Peek(Callable):
+    """
+    The smallest element of a heap or the last element of a deque.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, (LoxDeque, LoxHeap)):
+            raise NativeException("peek: Argument must be a deque or heap.")
+        if len(objekt) == 0:
+            raise NativeException("peek: Argument must not be empty.")
+
+        if isinstance(objekt, LoxHeap):
+            return objekt.peek()
+        return objekt.elements[-1]
+
+    def __str__(self) -> str:
+        return "<native fn: peek>"
+
+
+class PeekFront(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxDeque):
+            raise NativeException("peekfront: Argument must be a deque.")
+        if len(objekt) == 0:
+            raise NativeException("peekfront: Argument must not be empty.")
+
+        return objekt.elements[0]
+
+    def __str__(self) -> str:
+        return "<native fn: peekfront>"
+
+
+class Pop(Callable):
+    """
+    Removes and returns the smallest element of a heap or the last element
+    of a deque.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, (LoxDeque, LoxHeap)):
+            raise NativeException("pop: Argument must be a deque or heap.")
+        if len(objekt) == 0:
+            raise NativeException("pop: Argument must not be empty.")
+
+        return objekt.elements.pop() if isinstance(objekt, LoxDeque) else objekt.pop()
+
+    def __str__(self) -> str:
+        return "<native fn: pop>"
+
+
+class PopFront(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxDeque):
+            raise NativeException("popfront: Argument must be a deque.")
+        if len(objekt) == 0:
+            raise NativeException("popfront: Argument must not be empty.")
+
+        return objekt.elements.popleft()
+
+    def __str__(self) -> str:
+        return "<native fn: popfront>"
+
+
+class Push(Callable):
+    """
+    Adds an element to a heap or to the end of a deque.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, element = arguments
+
+        if isinstance(objekt, LoxDeque):
+            objekt.elements.append(element)
+        elif isinstance(objekt, LoxHeap):
+            try:
+                objekt.push(element)
+            except TypeError:
+                raise NativeException("push: Heap priorities must all be numbers or all be strings.")
+        else:
+            raise NativeException("push: First argument must be a deque or heap.")
+
+    def __str__(self) -> str:
+        return "<native fn: push>"
+
+
+class PushFront(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, element = arguments
+
+        if not isinstance(objekt, LoxDeque):
+            raise NativeException("pushfront: First argument must be a deque.")
+
+        objekt.elements.appendleft(element)
+
+    def __str__(self) -> str:
+        return "<native fn: pushfront>"
+
+
+class ReadAsync(Callable):
+    """
+    A future of the contents of a file, which is read on a worker thread.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename = arguments[0]
+
+        if not isinstance(filename, str):
+            raise NativeException("readasync: Argument must be a string.")
+
+        if not os.path.exists(filename):
+            raise NativeException("readasync: File cannot be found.")
+
+        return LoxFuture(interpreter.event_loop().run_in_executor(None, read_text, filename))
+
+    def __str__(self) -> str:
+        return "<native fn: readasync>"
+
+
+class ReadBytes(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename = arguments[0]
+
+        if not isinstance(filename, str):
+            raise NativeException("readbytes: Argument must be a string.")
+
+        if not os.path.exists(filename):
+            raise NativeException("readbytes: File cannot be found.")
+
+        try:
+            with open(filename, "rb") as f:
+                return LoxBytes(bytearray(f.read()))
+        except OSError:
+            raise NativeException("readbytes: File cannot be opened.")
+
+    def __str__(self) -> str:
+        return "<native fn: readbytes>"
+
+
+class ReadChunk(Callable):
+    """
+    The next `size` characters of a file, fewer at its end, or nil once it
+    has been read.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle, size = arguments
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("readchunk: First argument must be a file.")
+        if not handle.is_open():
+            raise NativeException("readchunk: File is closed.")
+        if not handle.is_readable():
+            raise NativeException("readchunk: File is not open for reading.")
+        if not isinstance(size, float) or not size.is_integer() or size < 1:
+            raise NativeException("readchunk: Second argument must be a positive integer.")
+
+        return handle.read(int(size))
+
+    def __str__(self) -> str:
+        return "<native fn: readchunk>"
+
+
+class ReadFile(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename = arguments[0]
+
+        if not isinstance(filename, str):
+            raise NativeException("readfile: Argument must be a string.")
+
+        if not os.path.exists(filename):
+            raise NativeException("readfile: File cannot be found.")
+
+        with open(filename, encoding="latin-1") as f:
+            return f.read()
+
+    def __str__(self) -> str:
+        return "<native fn: readfile>"
+
+
+class ReadLine(Callable):
+    """
+    The next line of a file without its line break, or nil once it has been
+    read.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle = arguments[0]
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("readline: Argument must be a file.")
+        if not handle.is_open():
+            raise NativeException("readline: File is closed.")
+        if not handle.is_readable():
+            raise NativeException("readline: File is not open for reading.")
+
+        return handle.readline()
+
+    def __str__(self) -> str:
+        return "<native fn: readline>"
+
+
+class ReadLines(Callable):
+    """
+    The remaining lines of a file without their line breaks.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle = arguments[0]
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("readlines: Argument must be a file.")
+        if not handle.is_open():
+            raise NativeException("readlines: File is closed.")
+        if not handle.is_readable():
+            raise NativeException("readlines: File is not open for reading.")
+
+        return LoxArray(list(handle.lines()))
+
+    def __str__(self) -> str:
+        return "<native fn: readlines>"
+
+
+class Reload(Callable):
+    """
+    Runs a file again, even when it has already been imported and has not
+    been modified since.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename = arguments[0]
+
+        if not isinstance(filename, str):
+            raise NativeException("reload: Argument must be a string.")
+
+        if not os.path.exists(filename):
+            raise NativeException("reload: File cannot be found.")
+
+        interpreter.import_module(filename, reload=True)
+
+    def __str__(self) -> str:
+        return "<native fn: reload>"
+
+
+class Remove(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, key = arguments
+
+        if not isinstance(objekt, (LoxMap, LoxSet)):
+            raise NativeException("remove: First argument must be a map or set.")
+
+        objekt.remove(key)
+
+    def __str__(self) -> str:
+        return "<native fn: remove>"
+
+
+class Replace(Callable):
+
+    def arity(self) -> int:
+        return 3
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text, old, new = arguments
+
+        if not all(isinstance(argument, str) for argument in arguments):
+            raise NativeException("replace: Arguments must be strings.")
+
+        return text.replace(old, new)
+
+    def __str__(self) -> str:
+        return "<native fn: replace>"
+
+
+class Reverse(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("reverse: Argument must be an array.")
+
+        objekt.replace(objekt.elements[::-1])
+
+    def __str__(self) -> str:
+        return "<native fn: reverse>"
+
+
+class Ring(Callable):
+    """
+    An empty deque holding at most `capacity` elements.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        capacity = arguments[0]
+
+        if not isinstance(capacity, float) or capacity < 1:
+            raise NativeException("ring: Argument must be a positive number.")
+
+        return LoxDeque(int(capacity))
+
+    def __str__(self) -> str:
+        return "<native fn: ring>"
+
+
+class Shell(Callable):
+    """
+    A future of the standard output of a shell command, which is started
+    straight away.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        command = arguments[0]
+
+        if not isinstance(command, str):
+            raise NativeException("shell: Argument must be a string.")
+
+        loop = interpreter.event_loop()
+        task = loop.create_task(run_command(command))
+        # One step of the loop spawns the process.
+        loop.run_until_complete(asyncio.sleep(0))
+        return LoxFuture(task)
+
+    def __str__(self) -> str:
+        return "<native fn: shell>"
+
+
+class SetCallable(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("set: Argument must be an array.")
+
+        hash_set = LoxSet()
+        for element in objekt.elements:
+            if not is_key(element):
+                raise NativeException("set: Elements must be numbers, strings, booleans, nil or instances.")
+            hash_set.add(element)
+        return hash_set
+
+    def __str__(self) -> str:
+        return "<native fn: set>"
+
+
+class Slice(Callable):
+    """
+    A new array or bytes with the elements from index `start` up to, but
+    not including, index `end`.
+    """
+
+    def arity(self) -> int:
+        return 3
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, start, end = arguments
+
+        if not isinstance(objekt, (LoxArray, LoxBytes)):
+            raise NativeException("slice: First argument must be an array or bytes.")
+        if not isinstance(start, float) or not isinstance(end, float):
+            raise NativeException("slice: Second and third arguments must be numbers.")
+        if not 0 <= int(start) <= int(end) <= len(objekt):
+            raise NativeException("slice: Invalid range.")
+
+        if isinstance(objekt, LoxBytes):
+            return objekt.copy(slice(int(start), int(end)))
+        return LoxArray(objekt.elements[int(start):int(end)])
+
+    def __str__(self) -> str:
+        return "<native fn: slice>"
+
+
+class Sort(Callable):
+    """
+    Sorts an array in place, stably. Elements are compared directly when
+    `order` is nil, by the number returned by `order(a, b)` (negative when
+    `a` goes first) when it takes two arguments, or by the value of
+    `order(element)` when it takes one, which is called once per element.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, order = arguments
+
+        if not isinstance(objekt, LoxArray):
+            raise NativeException("sort: First argument must be an array.")
+        if order is not None and (not isinstance(order, Callable) or order.arity() not in (1, 2)):
+            raise NativeException("sort: Second argument must be a function of one or two arguments or nil.")
+
+        if order is None:
+            key = None
+        elif order.arity() == 1:
+            key = interpreter.callback(order)
+        else:
+            key = functools.cmp_to_key(interpreter.callback(order))
+
+        try:
+            objekt.replace(sorted(objekt.elements, key=key))
+        except TypeError:
+            raise NativeException("sort: Can only compare numbers or strings.")
+
+    def __str__(self) -> str:
+        return "<native fn: sort>"
+
+
+class Split(Callable):
+    """
+    The parts of a string between occurrences of `separator`, or between runs
+    of whitespace when `separator` is nil.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text, separator = arguments
+
+        if not isinstance(text, str):
+            raise NativeException("split: First argument must be a string.")
+        if separator is not None and (not isinstance(separator, str) or separator == ""):
+            raise NativeException("split: Second argument must be a non-empty string or nil.")
+
+        return LoxArray(text.split(separator))
+
+    def __str__(self) -> str:
+        return "<native fn: split>"
+
+
+class StartsWith(Callable):
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text, prefix = arguments
+
+        if not isinstance(text, str) or not isinstance(prefix, str):
+            raise NativeException("startswith: Arguments must be strings.")
+
+        return text.startswith(prefix)
+
+    def __str__(self) -> str:
+        return "<native fn: startswith>"
+
+
+class Substr(Callable):
+    """
+    The characters of a string from index `start` up to, but not including,
+    index `end`.
+    """
+
+    def arity(self) -> int:
+        return 3
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text, start, end = arguments
+
+        if not isinstance(text, (str, LoxMappedString)):
+            raise NativeException("substr: First argument must be a string or mapped file.")
+        if not isinstance(start, float) or not isinstance(end, float):
+            raise NativeException("substr: Second and third arguments must be numbers.")
+        if not 0 <= int(start) <= int(end) <= len(text):
+            raise NativeException("substr: Invalid range.")
+
+        return text[int(start):int(end)]
+
+    def __str__(self) -> str:
+        return "<native fn: substr>"
+
+
+class Sum(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, LoxArray) or not objekt.holds_numbers():
+            raise NativeException("sum: Argument must be an array of numbers.")
+
+        return float(sum(objekt.elements))
+
+    def __str__(self) -> str:
+        return "<native fn: sum>"
+
+
+class Trim(Callable):
+    """
+    A string without its leading and trailing whitespace.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text = arguments[0]
+
+        if not isinstance(text, str):
+            raise NativeException("trim: Argument must be a string.")
+
+        return text.strip()
+
+    def __str__(self) -> str:
+        return "<native fn: trim>"
+
+
+class Upper(Callable):
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        text = arguments[0]
+
+        if not isinstance(text, str):
+            raise NativeException("upper: Argument must be a string.")
+
+        return text.upper()
+
+    def __str__(self) -> str:
+        return "<native fn: upper>"
+
+
+class Values(Callable):
+    """
+    The values of a map, in insertion order of their keys, or the numbers of
+    bytes.
+    """
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt = arguments[0]
+
+        if not isinstance(objekt, (LoxBytes, LoxMap)):
+            raise NativeException("values: Argument must be a map or bytes.")
+
+        return LoxArray(objekt.values())
+
+    def __str__(self) -> str:
+        return "<native fn: values>"
+
+
+class View(Callable):
+    """
+    An array or bytes of the elements from index `start` up to, but not
+    including, index `end`, every `step` elements, sharing the storage of the
+    array or bytes.
+    """
+
+    def arity(self) -> int:
+        return 4
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        objekt, start, end, step = arguments
+
+        if not isinstance(objekt, (LoxArray, LoxBytes)):
+            raise NativeException("view: First argument must be an array or bytes.")
+        if not all(isinstance(argument, float) for argument in (start, end, step)):
+            raise NativeException("view: Last three arguments must be numbers.")
+        if not 0 <= int(start) <= int(end) <= len(objekt) or int(step) < 1:
+            raise NativeException("view: Invalid range.")
+
+        if isinstance(objekt, LoxBytes):
+            return objekt.view(slice(int(start), int(end), int(step)))
+        return LoxArrayView(objekt, range(int(start), int(end), int(step)))
+
+    def __str__(self) -> str:
+        return "<native fn: view>"
+
+
+class Write(Callable):
+    """
+    Writes a value to a file opened for writing or appending, as print would
+    show it but without a line break.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        handle, value = arguments
+
+        if not isinstance(handle, LoxFile):
+            raise NativeException("write: First argument must be a file.")
+        if not handle.is_open():
+            raise NativeException("write: File is closed.")
+        if handle.is_readable():
+            raise NativeException("write: File is not open for writing.")
+        if isinstance(value, str) and not value.isascii() and max(value) > "\xff":
+            raise NativeException("write: Invalid character set. Can only handle ASCII.")
+
+        handle.write(value)
+
+    def __str__(self) -> str:
+        return "<native fn: write>"
+
+
+class WriteAsync(Callable):
+    """
+    A future of nil, done once a string has been written to a file on a
+    worker thread.
+    """
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[object]) -> object:
+        filename, text = arguments
+
+        if not isinstance(filename, str):
+            raise NativeException("writeasync: First argument must be a string.")
+        if isinstance(text, LoxStringBuilder):
+            text = text.build()
+        if not isinstance(text, str):
+            raise NativeException("writeasync: Second argument must be a string or string builder.")
+        if not text.isascii() and max(text) > "\xff":
+            raise NativeException("writeasync: Invalid character set. Can only handle ASCII.")
+
+        return LoxFuture(interpreter.event_loop().run_in_executor(None, write_text, filename, text))
+
+    def __str__(self) -> str:
+        return "<native fn: writeasync>"
 
 
 class WriteFile(Callable):
@@ -162,8 +1534,17 @@ class WriteFile(Callable):
 
         if not isinstance(filename, str):
             raise NativeException("writefile: First argument must be a string.")
+        if isinstance(text, LoxBytes):
+            try:
+                with open(filename, "wb") as f:
+                    f.write(text.data)
+            except OSError:
+                raise NativeException("writefile: File cannot be opened.")
+            return
+        if isinstance(text, LoxStringBuilder):
+            text = text.build()
         if not isinstance(text, str):
-            raise NativeException("writefile: Second argument must be a string.")
+            raise NativeException("writefile: Second argument must be a string, string builder or bytes.")
 
         try:
             with open(filename, "w", encoding="latin-1") as f:
@@ -0,0 +1,65 @@
+import sys
+
+from lox_array import LoxArray
+from util import stringify
+
+
+class Output:
+    """
+    Buffers what the interpreter prints and writes it to `stream` once at
+    least `size` characters are pending, or when flushed. A `size` of 0
+    writes through. Without a stream, the current `sys.stdout` is used.
+
+    Arrays are stringified `chunk` elements at a time so that printing a
+    huge one never builds its whole string.
+    """
+
+    size = 1 << 16
+    chunk = 1 << 12
+
+    def __init__(self, stream: "typing.TextIO" = None, size: int = None):
+        self.stream = stream
+        if size is not None:
+            self.size = size
+        self.parts = []
+        self.length = 0
+
+    def write(self, text: str):
+        self.parts.append(text)
+        self.length += len(text)
+        if self.length >= self.size:
+            self.flush()
+
+    def write_value(self, value: object):
+        if not isinstance(value, LoxArray) or len(value) <= self.chunk:
+            self.write(stringify(value))
+            return
+
+        self.write("[")
+        elements = value.elements
+        for start in range(0, len(elements), self.chunk):
+            if start:
+                self.write(",")
+            chunk = elements[start:start + self.chunk]
+            if value.is_typed():
+                self.write(",".join([stringify(element) for element in chunk]))
+                continue
+            for index, element in enumerate(chunk):
+                if index:
+                    self.write(",")
+                self.write_value(element)
+        self.write("]")
+
+    def print(self, value: object):
+        self.write_value(value)
+        self.write("\n")
+
+    def flush(self):
+        if not self.parts:
+            return
+        text = "".join(self.parts)
+        self.parts.clear()
+        self.length = 0
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        stream.flush()
@@ -1,6 +1,6 @@
 import typing
 
-from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
+from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, HashMap, HashSet, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
 from stmt import Block, Break, Class, Expression, Function, If, Import, Print, Return, Stmt, Var, While
 from lox_token import Token
 from token_type import TokenType
@@ -449,8 +449,33 @@ class Parser:
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
             return Grouping(expression)
 
+        if self.match(TokenType.HASH):
+            return self.hash_literal()
+
         raise self.error(self.peek(), "Expect expression.")
 
+    def hash_literal(self) -> Expr:
+        brace = self.consume(TokenType.LEFT_BRACE, "Expect '{' after '#'.")
+        if self.match(TokenType.RIGHT_BRACE):
+            return HashMap([], [], brace)
+
+        first = self.assignment()
+        if self.match(TokenType.COLON):
+            keys = [first]
+            values = [self.array()]
+            while self.match(TokenType.COMMA):
+                keys.append(self.assignment())
+                self.consume(TokenType.COLON, "Expect ':' after map key.")
+                values.append(self.array())
+            self.consume(TokenType.RIGHT_BRACE, "Expect '}' to complete map.")
+            return HashMap(keys, values, brace)
+
+        elements = [first]
+        while self.match(TokenType.COMMA):
+            elements.append(self.assignment())
+        self.consume(TokenType.RIGHT_BRACE, "Expect '}' to complete set.")
+        return HashSet(elements, brace)
+
     def match(self, *types) -> bool:
         for type_ in types:
             if self.check(type_):
@@ -1,7 +1,7 @@
 import typing
 from enum import Enum, auto
 
-from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
+from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, HashMap, HashSet, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
 from interpreter import Interpreter
 from stmt import Block, Break, Class, Expression, Function, If, Import, Print, Return, Stmt, Var, While
 from lox_token import Token
@@ -58,6 +58,15 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
     def visit_grouping_expr(self, expr: Grouping) -> object:
         self.resolve(expr.expression)
 
+    def visit_hashmap_expr(self, expr: HashMap) -> object:
+        for key, value in zip(expr.keys, expr.values):
+            self.resolve(key)
+            self.resolve(value)
+
+    def visit_hashset_expr(self, expr: HashSet) -> object:
+        for element in expr.elements:
+            self.resolve(element)
+
     def visit_lambda_expr(self, expr: Lambda) -> object:
         self.resolve_function(expr, FunctionType.FUNCTION)
 
@@ -123,17 +132,12 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
             for superclass in stmt.superclasses:
                 self.resolve(superclass)
 
-        self.begin_scope()
-        self.scopes[-1]["this"] = {"is_defined": True, "token": stmt.name}
-
         for method in stmt.class_methods+stmt.instance_methods+stmt.getters:
             declaration = FunctionType.METHOD
             if method.name.lexeme == "init":
                 declaration = FunctionType.INITIALIZER
             self.resolve_function(method, declaration)
 
-        self.end_scope()
-
         self.current_class = enclosing_class
 
     def visit_expression_stmt(self, stmt: Expression):
@@ -150,6 +154,9 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
         self.current_function = _type
 
         self.begin_scope()
+        if _type in (FunctionType.METHOD, FunctionType.INITIALIZER):
+            # Methods get "this" in the same environment as their parameters.
+            self.scopes[-1]["this"] = {"is_defined": True, "token": function.name}
         for param in function.params:
             self.declare(param)
             self.define(param)
@@ -225,7 +232,6 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
 
     def end_scope(self):
         scope = self.scopes.pop()
-        used_locals = {expr.name.lexeme for expr in self.interpreter.locals.keys() if not (isinstance(expr, This))}
-        for var in set(scope.keys()).difference(used_locals):
+        for var in set(scope.keys()).difference(self.interpreter.local_names):
             if var != "this":
                 self.interpreter.reporter.parse_error(scope[var]["token"], "Unused local variable {}.".format(var))
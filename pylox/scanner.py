@@ -74,6 +74,8 @@ class Scanner:
             return self.new_token(TokenType.EROTEME)
         elif c == ':':
             return self.new_token(TokenType.COLON)
+        elif c == '#':
+            return self.new_token(TokenType.HASH)
         elif c == '!':
             return self.new_token(TokenType.BANG_EQUAL if self.match('=') else TokenType.BANG)
         elif c == '=':
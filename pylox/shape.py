@@ -0,0 +1,29 @@
+class Shape:
+    """
+    The layout of the fields of instances: which slot of `Instance.values`
+    holds each field.
+
+    Instances start with the empty shape of their class and follow its
+    transitions as fields are added, so instances whose fields are added in
+    the same order share their shapes. A shape refuses to grow past
+    `max_fields` fields or `max_transitions` different next fields, the
+    instance then keeps its fields in a dictionary instead.
+    """
+
+    max_fields = 64
+    max_transitions = 16
+
+    def __init__(self, klass: "LoxClass", slots: dict[str, int] = None):
+        self.klass = klass
+        self.slots = slots if slots is not None else dict()
+        self.transitions = dict()
+
+    def add(self, name: str) -> "Shape":
+        shape = self.transitions.get(name)
+        if shape is None:
+            if len(self.slots) >= self.max_fields or len(self.transitions) >= self.max_transitions:
+                return None
+            slots = dict(self.slots)
+            slots[name] = len(slots)
+            shape = self.transitions[name] = Shape(self.klass, slots)
+        return shape
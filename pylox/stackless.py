@@ -0,0 +1,363 @@
+from typing import Generator
+
+from lox_array import LoxArray
+from environment import Environment
+from expr import Array, Assign, Binary, Call, Expr, Index, Get, Grouping, HashMap, HashSet, Lambda, Literal, Logical, Set, SetArray, Ternary, This, Unary, Variable
+from exception import BreakUnwindStackException, ReturnException
+from function import LoxFunction
+from instance import Instance
+from lox_class import LoxClass
+from stmt import Block, Break, Class, Expression, Function, If, Import, Print, Return, Stmt, Var, While
+
+
+class CallFinder(Expr.Visitor, Stmt.Visitor):
+    """
+    Collects the nodes whose evaluation may call a Lox function, getters
+    included. Only those run on the stackless engine.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.found = set()
+
+    def find(self, statements: list[Stmt]) -> set:
+        self.visit_all(statements)
+        return self.found
+
+    def visit(self, node: [Expr, Stmt]) -> bool:
+        if node is not None and node.accept(self):
+            self.found.add(node)
+            return True
+        return False
+
+    def visit_all(self, nodes: list[[Expr, Stmt]]) -> bool:
+        found = False
+        for node in nodes:
+            found = self.visit(node) or found
+        return found
+
+    def visit_array_expr(self, expr: Array) -> bool:
+        return self.visit_all(expr.elements)
+
+    def visit_assign_expr(self, expr: Assign) -> bool:
+        return self.visit(expr.value)
+
+    def visit_binary_expr(self, expr: Binary) -> bool:
+        return self.visit_all((expr.left, expr.right))
+
+    def visit_call_expr(self, expr: Call) -> bool:
+        self.visit(expr.callee)
+        self.visit_all(expr.arguments)
+        return True
+
+    def visit_index_expr(self, expr: Index) -> bool:
+        return self.visit_all((expr.objekt, expr.index))
+
+    def visit_get_expr(self, expr: Get) -> bool:
+        self.visit(expr.objekt)
+        return True
+
+    def visit_grouping_expr(self, expr: Grouping) -> bool:
+        return self.visit(expr.expression)
+
+    def visit_hashmap_expr(self, expr: HashMap) -> bool:
+        return self.visit_all(expr.keys + expr.values)
+
+    def visit_hashset_expr(self, expr: HashSet) -> bool:
+        return self.visit_all(expr.elements)
+
+    def visit_lambda_expr(self, expr: Lambda) -> bool:
+        self.visit_all(expr.body)
+        return False
+
+    def visit_literal_expr(self, expr: Literal) -> bool:
+        return False
+
+    def visit_logical_expr(self, expr: Logical) -> bool:
+        return self.visit_all((expr.left, expr.right))
+
+    def visit_set_expr(self, expr: Set) -> bool:
+        return self.visit_all((expr.objekt, expr.value))
+
+    def visit_setarray_expr(self, expr: SetArray) -> bool:
+        return self.visit_all((expr.objekt, expr.index, expr.value))
+
+    def visit_ternary_expr(self, expr: Ternary) -> bool:
+        return self.visit_all((expr.conditional, expr.truthy, expr.falsy))
+
+    def visit_this_expr(self, expr: This) -> bool:
+        return False
+
+    def visit_unary_expr(self, expr: Unary) -> bool:
+        return self.visit(expr.right)
+
+    def visit_variable_expr(self, expr: Variable) -> bool:
+        return False
+
+    def visit_block_stmt(self, stmt: Block) -> bool:
+        return self.visit_all(stmt.statements)
+
+    def visit_break_stmt(self, stmt: Break) -> bool:
+        return False
+
+    def visit_class_stmt(self, stmt: Class) -> bool:
+        self.visit_all(stmt.class_methods+stmt.instance_methods+stmt.getters)
+        return False
+
+    def visit_expression_stmt(self, stmt: Expression) -> bool:
+        return self.visit(stmt.expression)
+
+    def visit_function_stmt(self, stmt: Function) -> bool:
+        self.visit_all(stmt.body)
+        return False
+
+    def visit_if_stmt(self, stmt: If) -> bool:
+        return self.visit_all((stmt.condition, stmt.then_branch, stmt.else_branch))
+
+    def visit_import_stmt(self, stmt: Import) -> bool:
+        return False
+
+    def visit_print_stmt(self, stmt: Print) -> bool:
+        return self.visit(stmt.expression)
+
+    def visit_return_stmt(self, stmt: Return) -> bool:
+        return self.visit(stmt.value)
+
+    def visit_var_stmt(self, stmt: Var) -> bool:
+        return self.visit(stmt.initializer)
+
+    def visit_while_stmt(self, stmt: While) -> bool:
+        return self.visit_all((stmt.condition, stmt.body))
+
+
+class Stackless(Expr.Visitor, Stmt.Visitor):
+    """
+    Evaluates the nodes found by `CallFinder` as generators, keeping Lox
+    calls on a heap allocated stack instead of the Python stack.
+    """
+
+    def __init__(self, interpreter: "Interpreter"):
+        super().__init__()
+        self.interpreter = interpreter
+
+    def run(self, routine: Generator) -> object:
+        stack = [routine]
+        value = None
+        error = None
+        while True:
+            routine = stack[-1]
+            try:
+                if error is None:
+                    routine = routine.send(value)
+                else:
+                    exception, error = error, None
+                    routine = routine.throw(exception)
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    return stop.value
+                value = stop.value
+                continue
+            except Exception as exception:
+                stack.pop()
+                if not stack:
+                    raise
+                error = exception.with_traceback(None)
+                continue
+
+            stack.append(routine)
+            value = None
+
+    def execute_block(self, statements: list[Stmt], environment: Environment) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        previous = interpreter.environment
+        try:
+            interpreter.environment = environment
+            for statement in statements:
+                if statement in suspendable:
+                    yield from statement.accept(self)
+                else:
+                    statement.accept(interpreter)
+        finally:
+            interpreter.environment = previous
+
+    def visit_array_expr(self, expr: Array) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        elements = []
+        for element in expr.elements:
+            elements.append((yield from element.accept(self)) if element in suspendable else element.accept(interpreter))
+        return LoxArray(elements)
+
+    def visit_assign_expr(self, expr: Assign) -> Generator:
+        value = yield from expr.value.accept(self)
+        return self.interpreter.assign_variable(expr, value)
+
+    def visit_binary_expr(self, expr: Binary) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        left = (yield from expr.left.accept(self)) if expr.left in suspendable else expr.left.accept(interpreter)
+        right = (yield from expr.right.accept(self)) if expr.right in suspendable else expr.right.accept(interpreter)
+        return interpreter.binary_operation(expr, left, right)
+
+    def visit_call_expr(self, expr: Call) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        callee = expr.callee
+        if type(callee) is Get:
+            # objekt.name(...) invokes the method directly when possible,
+            # bound methods are only created when used as values.
+            objekt = (yield from callee.objekt.accept(self)) if callee.objekt in suspendable else callee.objekt.accept(interpreter)
+            method = interpreter.invoked_method(callee, objekt)
+            if method is None:
+                callee = interpreter.get_property(callee, objekt)
+                if interpreter.is_getter(callee):
+                    callee = yield callee.routine(interpreter, ())
+            else:
+                callee = method
+        else:
+            method = None
+            callee = (yield from callee.accept(self)) if callee in suspendable else callee.accept(interpreter)
+
+        arguments = []
+        for argument in expr.arguments:
+            arguments.append((yield from argument.accept(self)) if argument in suspendable else argument.accept(interpreter))
+
+        if type(callee) is LoxFunction and len(arguments) == callee.descriptor.arity:
+            if method is not None:
+                return (yield method.routine(interpreter, arguments, objekt))
+            return (yield callee.routine(interpreter, arguments))
+        if type(callee) is LoxClass and len(arguments) == callee.initializer_arity:
+            # The initializer runs on the new instance without the class's own
+            # routine in between.
+            instance = Instance(callee)
+            if callee.initializer is not None:
+                yield callee.initializer.routine(interpreter, arguments, instance)
+            return instance
+
+        interpreter.check_call(expr, callee, arguments)
+        if interpreter.is_routine(callee):
+            return (yield callee.routine(interpreter, arguments))
+        return callee.call(interpreter, arguments)
+
+    def visit_index_expr(self, expr: Index) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        objekt = (yield from expr.objekt.accept(self)) if expr.objekt in suspendable else expr.objekt.accept(interpreter)
+        index = (yield from expr.index.accept(self)) if expr.index in suspendable else expr.index.accept(interpreter)
+        return interpreter.index_value(expr, objekt, index)
+
+    def visit_get_expr(self, expr: Get) -> Generator:
+        interpreter = self.interpreter
+        objekt = (yield from expr.objekt.accept(self)) if expr.objekt in interpreter.suspendable else expr.objekt.accept(interpreter)
+        res = interpreter.get_property(expr, objekt)
+        if interpreter.is_getter(res):
+            return (yield res.routine(interpreter, ()))
+        return res
+
+    def visit_grouping_expr(self, expr: Grouping) -> Generator:
+        return (yield from expr.expression.accept(self))
+
+    def visit_hashmap_expr(self, expr: HashMap) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        keys = []
+        values = []
+        for key, value in zip(expr.keys, expr.values):
+            keys.append((yield from key.accept(self)) if key in suspendable else key.accept(interpreter))
+            values.append((yield from value.accept(self)) if value in suspendable else value.accept(interpreter))
+        return interpreter.new_map(expr, keys, values)
+
+    def visit_hashset_expr(self, expr: HashSet) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        elements = []
+        for element in expr.elements:
+            elements.append((yield from element.accept(self)) if element in suspendable else element.accept(interpreter))
+        return interpreter.new_set(expr, elements)
+
+    def visit_logical_expr(self, expr: Logical) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        left = (yield from expr.left.accept(self)) if expr.left in suspendable else expr.left.accept(interpreter)
+        if interpreter.short_circuits(expr, left):
+            return left
+        return (yield from expr.right.accept(self)) if expr.right in suspendable else expr.right.accept(interpreter)
+
+    def visit_set_expr(self, expr: Set) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        objekt = (yield from expr.objekt.accept(self)) if expr.objekt in suspendable else expr.objekt.accept(interpreter)
+        interpreter.check_fields(expr, objekt)
+        value = (yield from expr.value.accept(self)) if expr.value in suspendable else expr.value.accept(interpreter)
+        interpreter.set_property(expr, objekt, value)
+
+    def visit_setarray_expr(self, expr: SetArray) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        objekt = (yield from expr.objekt.accept(self)) if expr.objekt in suspendable else expr.objekt.accept(interpreter)
+        interpreter.check_array(expr, objekt)
+        index = (yield from expr.index.accept(self)) if expr.index in suspendable else expr.index.accept(interpreter)
+        interpreter.check_index(expr, objekt, index)
+        value = (yield from expr.value.accept(self)) if expr.value in suspendable else expr.value.accept(interpreter)
+        interpreter.set_element(expr, objekt, index, value)
+
+    def visit_ternary_expr(self, expr: Ternary) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        conditional = (yield from expr.conditional.accept(self)) if expr.conditional in suspendable else expr.conditional.accept(interpreter)
+        branch = expr.truthy if conditional else expr.falsy
+        return (yield from branch.accept(self)) if branch in suspendable else branch.accept(interpreter)
+
+    def visit_unary_expr(self, expr: Unary) -> Generator:
+        right = yield from expr.right.accept(self)
+        return self.interpreter.unary_operation(expr, right)
+
+    def visit_block_stmt(self, stmt: Block) -> Generator:
+        return self.execute_block(stmt.statements, Environment(self.interpreter.environment))
+
+    def visit_expression_stmt(self, stmt: Expression) -> Generator:
+        value = yield from stmt.expression.accept(self)
+        if self.interpreter.is_repl:
+            self.interpreter.output.print(value)
+
+    def visit_if_stmt(self, stmt: If) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        condition = (yield from stmt.condition.accept(self)) if stmt.condition in suspendable else stmt.condition.accept(interpreter)
+        if interpreter.is_truthy(condition):
+            branch = stmt.then_branch
+        elif stmt.else_branch is not None:
+            branch = stmt.else_branch
+        else:
+            return
+        if branch in suspendable:
+            yield from branch.accept(self)
+        else:
+            branch.accept(interpreter)
+
+    def visit_print_stmt(self, stmt: Print) -> Generator:
+        value = yield from stmt.expression.accept(self)
+        self.interpreter.output.print(value)
+
+    def visit_return_stmt(self, stmt: Return) -> Generator:
+        raise ReturnException((yield from stmt.value.accept(self)))
+
+    def visit_var_stmt(self, stmt: Var) -> Generator:
+        value = yield from stmt.initializer.accept(self)
+        self.interpreter.environment.initialize(stmt.name.lexeme, value)
+
+    def visit_while_stmt(self, stmt: While) -> Generator:
+        interpreter = self.interpreter
+        suspendable = interpreter.suspendable
+        condition = stmt.condition
+        body = stmt.body
+        while interpreter.is_truthy((yield from condition.accept(self)) if condition in suspendable else condition.accept(interpreter)):
+            try:
+                if body in suspendable:
+                    yield from body.accept(self)
+                else:
+                    body.accept(interpreter)
+            except BreakUnwindStackException:
+                return
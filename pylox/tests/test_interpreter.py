@@ -0,0 +1,889 @@
+import gc
+import io
+import os
+import pickle
+import weakref
+
+import pytest
+
+import frontend
+from frontend import parse_imports
+from function import LoxFunction
+from inline_cache import FieldCache
+from interpreter import Interpreter
+from lox import Lox
+from shape import Shape
+
+
+def run(source: str) -> Interpreter:
+    Lox.had_error = False
+    Lox.had_runtime_error = False
+    interpreter = Interpreter(Lox)
+    Lox.run(source, interpreter)
+    return interpreter
+
+
+def test_interpret_deep_recursion(capsys):
+    source = """
+        fun depth(n) { if (n == 0) return 0; return depth(n - 1) + 1; }
+        print depth(20000);
+    """
+
+    run(source)
+
+    assert "20000\n" == capsys.readouterr().out
+
+
+def test_interpret_frees_function_declarations_with_the_program(capsys):
+    source = """
+        fun adder(a) { fun add(b) { return a + b; } return add; }
+        var one = adder(1);
+        var two = adder(2);
+        print one(1) + two(1);
+    """
+
+    interpreter = run(source)
+
+    one = interpreter.globals.values["one"]
+    two = interpreter.globals.values["two"]
+    assert one.descriptor is two.descriptor
+    declaration = weakref.ref(one.declaration)
+    del interpreter, one, two
+    gc.collect()
+    assert declaration() is None
+    assert "5\n" == capsys.readouterr().out
+
+
+def test_interpret_deep_recursion_through_constructors_methods_and_getters(capsys):
+    source = """
+        class Node {
+            init(depth) {
+                this.depth = depth;
+                this.next = depth > 0 ? Node(depth - 1) : nil;
+            }
+            count() { return this.next == nil ? 1 : 1 + this.next.count(); }
+            total { return this.next == nil ? 0 : this.depth + this.next.total; }
+        }
+        var node = Node(5000);
+        print node.count();
+        print node.total;
+    """
+
+    run(source)
+
+    assert "5001\n12502500\n" == capsys.readouterr().out
+
+
+def test_interpret_runtime_error_unwinds_deep_recursion(capsys):
+    source = """
+        fun fail(n) { if (n == 0) return nil + 1; return fail(n - 1); }
+        fail(20000);
+    """
+
+    interpreter = run(source)
+
+    assert Lox.had_runtime_error
+    assert "Operands must be two numbers or two strings.\n[line 2]\n" == capsys.readouterr().out
+    assert interpreter.globals is interpreter.environment
+
+
+def test_interpret_break_and_return_inside_suspended_loops(capsys):
+    source = """
+        fun id(n) { return n; }
+        fun find() {
+            var i = 0;
+            while (id(true)) {
+                i = id(i + 1);
+                if (id(i) == 3) break;
+            }
+            while (true) {
+                i = i + 1;
+                if (id(i) == 7) return i;
+            }
+        }
+        print find();
+    """
+
+    run(source)
+
+    assert "7\n" == capsys.readouterr().out
+
+
+def test_interpret_lambda_declaration_is_shared_by_its_closures(capsys):
+    source = """
+        var sum = 0;
+        for (var i = 0; i < 3; i = i + 1) {
+            var add = fun(a) { return a + i; };
+            sum = sum + add(i);
+        }
+        print sum;
+    """
+
+    interpreter = run(source)
+
+    assert "6\n" == capsys.readouterr().out
+    assert 1 == len(interpreter.lambdas)
+
+
+def test_interpret_call_with_wrong_number_of_arguments(capsys):
+    source = """
+        fun f(a, b) { return a + b; }
+        f(1);
+    """
+
+    run(source)
+
+    assert Lox.had_runtime_error
+    assert "Expected 2 arguments but got 1.\n[line 3]\n" == capsys.readouterr().out
+
+
+def test_interpret_memoize_caches_results_by_argument_values(capsys):
+    source = """
+        fun paths(rows, columns) {
+            if (rows == 0 or columns == 0) return 1;
+            return paths(rows - 1, columns) + paths(rows, columns - 1);
+        }
+        paths = memoize(paths, nil);
+        print paths(10, 10);
+        print memostats(paths);
+    """
+
+    run(source)
+
+    assert "184756\n[81,120,120,nil]\n" == capsys.readouterr().out
+
+
+def test_interpret_memoize_evicts_least_recently_used_results(capsys):
+    source = """
+        fun square(x) { return x * x; }
+        var memoized = memoize(square, 2);
+        memoized(1); memoized(2); memoized(1); memoized(3); memoized(2);
+        print memostats(memoized);
+    """
+
+    run(source)
+
+    assert "[1,4,2,2]\n" == capsys.readouterr().out
+
+
+def test_interpret_memoize_calls_through_with_uncacheable_arguments(capsys):
+    source = """
+        class Point { init(x) { this.x = x; } }
+        var point = memoize(Point, 10);
+        var origin = Point(0);
+        print point(origin).x == origin;
+        print point(origin) == point(origin);
+        print memostats(point);
+    """
+
+    run(source)
+
+    assert "True\nFalse\n[0,0,0,10]\n" == capsys.readouterr().out
+
+
+def test_interpret_memoize_rejects_non_integer_sizes(capsys):
+    source = """
+        fun square(n) { return n * n; }
+        print memostats(memoize(square, 0));
+        memoize(square, 2.5);
+    """
+
+    run(source)
+
+    assert "[0,0,0,0]\nmemoize: Second argument must be a non-negative integer or nil.\n" == capsys.readouterr().out
+
+
+def test_interpret_method_resolution_prefers_first_superclass(capsys):
+    source = """
+        class A { name() { return "A"; } class make() { return "A.make"; } }
+        class B { name() { return "B"; } only() { return "B.only"; } class make() { return "B.make"; } }
+        class C < A, B { name() { return "C"; } }
+        var c = C();
+        print c.name();
+        print c.only();
+        print C.make();
+        print C.make == C.make;
+    """
+
+    run(source)
+
+    assert "A\nB.only\nA.make\nTrue\n" == capsys.readouterr().out
+
+
+def test_interpret_inner_skips_resolved_superclass(capsys):
+    source = """
+        class Base { greet() { print "base"; inner(Base, this, "greet")(); } }
+        class Derived < Base { greet() { print "derived"; } }
+        Derived().greet();
+    """
+
+    run(source)
+
+    assert "base\nderived\n" == capsys.readouterr().out
+
+
+def test_interpret_invoke_method_without_binding_it(capsys, monkeypatch):
+    bind = LoxFunction.bind
+    bound = []
+    monkeypatch.setattr(LoxFunction, "bind", lambda self, instance: bound.append(self) or bind(self, instance))
+    source = """
+        class Counter {
+            init() { this.count = 0; }
+            increment(by) { this.count = this.count + by; return this; }
+        }
+        var counter = Counter();
+        counter.increment(1).increment(2);
+        var increment = counter.increment;
+        increment(3);
+        print counter.count;
+    """
+
+    run(source)
+
+    assert "6\n" == capsys.readouterr().out
+    assert ["increment"] == [function.declaration.name.lexeme for function in bound]
+
+
+def test_interpret_invoke_prefers_fields_and_getters_over_methods(capsys):
+    source = """
+        class Box {
+            init() { this.value = fun() { return "field"; }; }
+            value() { return "method"; }
+            getter { return fun() { return "getter"; }; }
+            method() { return "method"; }
+        }
+        var box = Box();
+        print box.value();
+        print box.getter();
+        print box.method();
+    """
+
+    run(source)
+
+    assert "field\ngetter\nmethod\n" == capsys.readouterr().out
+
+
+def test_interpret_inline_caches_count_hits_per_receiver_class(capsys):
+    source = """
+        class A { name() { return "A"; } }
+        class B { name() { return "B"; } }
+        var objects = [A(), B(), A(), B()];
+        for (var i = 0; i < 4; i = i + 1) print objects[i].name();
+        class A { name() { return "redefined A"; } }
+        print A().name();
+        print cachestats();
+    """
+
+    run(source)
+
+    assert "A\nB\nA\nB\nredefined A\n[2,3,2,0]\n" == capsys.readouterr().out
+
+
+def test_interpret_inline_cache_becomes_megamorphic():
+    source = """
+        class A { name() {} } class B { name() {} } class C { name() {} }
+        class D { name() {} } class E { name() {} }
+        var objects = [A(), B(), C(), D(), E()];
+        for (var i = 0; i < 10; i = i + 1) objects[i - int(i / 5) * 5].name();
+    """
+
+    interpreter = run(source)
+
+    [cache] = interpreter.inline_caches
+    assert cache.is_megamorphic()
+    assert (4, 6) == (cache.hits, cache.misses)
+
+
+def test_interpret_inline_cache_holds_limit_classes():
+    source = """
+        class A { name() {} } class B { name() {} } class C { name() {} }
+        class D { name() {} }
+        var objects = [A(), B(), C(), D()];
+        for (var i = 0; i < 8; i = i + 1) objects[i - int(i / 4) * 4].name();
+    """
+
+    interpreter = run(source)
+
+    [cache] = interpreter.inline_caches
+    assert not cache.is_megamorphic()
+    assert (4, 4) == (cache.hits, cache.misses)
+
+
+def test_interpret_field_caches_store_slots_and_transitions(capsys):
+    source = """
+        class A { init() { this.x = 0; } }
+        class B { init() { this.y = 0; this.x = 0; } }
+        var objects = [A(), B(), A(), B()];
+        for (var i = 0; i < 4; i = i + 1) objects[i].x = i;
+        var a = A(); a.z = 1;
+        var b = A(); b.z = 2;
+        print objects[0].x + objects[1].x + objects[2].x + objects[3].x + a.z + b.z;
+    """
+
+    interpreter = run(source)
+
+    caches = [cache for cache in interpreter.inline_caches if isinstance(cache, FieldCache)]
+    assert "9\n" == capsys.readouterr().out
+    assert [(3, 1), (1, 1), (1, 1), (2, 2), (0, 1), (0, 1)] == [(cache.hits, cache.misses) for cache in caches]
+    assert [0.0, 2.0] == interpreter.globals.values["b"].values
+    assert [0.0, 3.0] == interpreter.globals.values["objects"].get(3).values
+    assert not any(cache.is_megamorphic() for cache in caches)
+
+
+def test_interpret_instances_share_shapes_by_field_order(capsys):
+    source = """
+        class Point { init(x, y) { this.x = x; this.y = y; } }
+        var a = Point(1, 2);
+        var b = Point(3, 4);
+        var c = Point(5, 6);
+        c.z = 7;
+        print a.x + b.y + c.z;
+    """
+
+    interpreter = run(source)
+
+    a, b, c = (interpreter.globals.values[name] for name in "abc")
+    assert "12\n" == capsys.readouterr().out
+    assert a.shape is b.shape
+    assert c.shape is a.shape.transitions["z"]
+    assert [1.0, 2.0] == a.values
+
+
+def test_interpret_instance_falls_back_to_dictionary_fields(capsys, monkeypatch):
+    monkeypatch.setattr(Shape, "max_fields", 2)
+    source = """
+        class Bag { init() { this.a = 1; this.b = 2; } total() { return this.a + this.b + this.c; } }
+        var bag = Bag();
+        bag.c = 3;
+        bag.a = 4;
+        print bag.total();
+        print bag.c;
+    """
+
+    interpreter = run(source)
+
+    bag = interpreter.globals.values["bag"]
+    assert "9\n3\n" == capsys.readouterr().out
+    assert bag.shape is None
+    assert {"a": 4.0, "b": 2.0, "c": 3.0} == bag.values
+
+
+def test_interpret_constructor_uses_initializer_resolved_by_class(capsys):
+    source = """
+        class A { init(x) { this.x = x; } }
+        class B < A {}
+        class C {}
+        print B(1).x;
+        class A { init(x, y) { this.x = x + y; } }
+        print B(2).x;
+        print C();
+        print A(1, 2).x;
+        B();
+    """
+
+    run(source)
+
+    assert Lox.had_runtime_error
+    assert "1\n2\nC instance\n3\nExpected 1 arguments but got 0.\n[line 10]\n" == capsys.readouterr().out
+
+
+def test_interpret_array_natives(capsys):
+    source = """
+        var a = [5, 3, 9, 1];
+        var b = copy(a);
+        fill(b, nil);
+        reverse(a);
+        print a;
+        print b;
+        print concat(slice(a, 1, 3), ["x"]);
+        sort(a, nil);
+        print a;
+        print bisect(a, 4);
+    """
+
+    run(source)
+
+    assert "[1,9,3,5]\n[nil,nil,nil,nil]\n[9,3,x]\n[1,3,5,9]\n2\n" == capsys.readouterr().out
+
+
+def test_interpret_sort_with_comparator_or_key_function(capsys):
+    source = """
+        class Word { init(text) { this.text = text; } size { return len(this.text); } }
+        var words = ["ccc", "a", "bb", "dd"];
+        sort(words, fun(x, y) { return len(y) - len(x); });
+        print words;
+        sort(words, len);
+        print words;
+        var objects = [Word("bb"), Word("a")];
+        sort(objects, fun(word) { return word.size; });
+        print objects[0].text;
+    """
+
+    run(source)
+
+    assert "[ccc,bb,dd,a]\n[a,bb,dd,ccc]\na\n" == capsys.readouterr().out
+
+
+def test_interpret_slice_with_invalid_range(capsys):
+    run("slice([1, 2], 1, 3);")
+
+    assert Lox.had_runtime_error
+    assert "slice: Invalid range.\n" == capsys.readouterr().out
+
+
+def test_interpret_elementwise_array_operations(capsys):
+    source = """
+        var a = [1, 2, 3];
+        var b = [4, 5, 6];
+        print a + b;
+        print 10 - a * 2;
+        print b / a;
+        print a < 2;
+        print a == a * 1;
+        print "a" + a;
+        print [sum(a), min(b), max(b), dot(a, b)];
+    """
+
+    run(source)
+
+    assert "[5,7,9]\n[8,6,4]\n[4,2.5,2]\n[True,False,False]\nTrue\na[1,2,3]\n[6,4,6,32]\n" == capsys.readouterr().out
+
+
+def test_interpret_elementwise_operation_on_arrays_of_different_lengths(capsys):
+    source = """
+        var a = [1, 2, 3];
+        var b = [1];
+        print a + b;
+    """
+
+    run(source)
+
+    assert Lox.had_runtime_error
+    assert "Array operands must have the same length.\n[line 4]\n" == capsys.readouterr().out
+
+
+def test_interpret_array_views_read_and_write_through(capsys):
+    source = """
+        var a = [0, 1, 2, 3, 4, 5, 6, 7];
+        var evens = view(a, 0, 8, 2);
+        var middle = view(evens, 1, 3, 1);
+        middle[0] = 20;
+        reverse(middle);
+        print a;
+        print evens;
+        print len(middle) + sum(middle);
+    """
+
+    run(source)
+
+    assert "[0,1,4,3,20,5,6,7]\n[0,4,20,6]\n26\n" == capsys.readouterr().out
+
+
+def test_interpret_map_and_set_literals_indexing_and_iteration(capsys):
+    source = """
+        class Point {}
+        var point = Point();
+        var names = #{1: "one", true: "yes", point: "point"};
+        names["two"] = 2;
+        remove(names, 1);
+        print names[true] + names[point];
+        print keys(names);
+        var seen = #{1, "a"};
+        seen[2] = true;
+        seen["a"] = false;
+        print seen;
+        print [len(names), len(seen), len(set([]))];
+        print seen[1];
+        print seen[true];
+    """
+
+    run(source)
+
+    assert "yespoint\n[True,Point instance,two]\n{1,2}\n[3,2,0]\nTrue\nFalse\n" == capsys.readouterr().out
+
+
+def test_interpret_map_with_undefined_key(capsys):
+    run('var m = #{"a": 1}; print m["b"];')
+
+    assert Lox.had_runtime_error
+    assert "Undefined key 'b'.\n[line 1]\n" == capsys.readouterr().out
+
+
+def test_interpret_heap_pops_by_key_in_insertion_order_for_ties(capsys):
+    source = """
+        var tasks = heap(fun(task) { return task[0]; });
+        var a = [2, "a"];
+        var b = [1, "b"];
+        var c = [2, "c"];
+        push(tasks, a);
+        push(tasks, b);
+        push(tasks, c);
+        print peek(tasks)[1];
+        print pop(tasks)[1] + pop(tasks)[1] + pop(tasks)[1];
+        print len(tasks);
+    """
+
+    run(source)
+
+    assert "b\nbac\n0\n" == capsys.readouterr().out
+
+
+def test_interpret_deque_and_ring_buffer(capsys):
+    source = """
+        var queue = deque();
+        push(queue, 1);
+        push(queue, 2);
+        pushfront(queue, 0);
+        print popfront(queue) + pop(queue);
+        print queue;
+        var window = ring(2);
+        push(window, 1);
+        push(window, 2);
+        push(window, 3);
+        print window;
+        pop(window);
+        pop(window);
+        pop(window);
+    """
+
+    run(source)
+
+    assert Lox.had_runtime_error
+    assert "2\ndeque[1]\nring[2,3]\npop: Argument must not be empty.\n" == capsys.readouterr().out
+
+
+def test_interpret_string_builder(capsys, tmp_path):
+    path = tmp_path / "built.txt"
+    source = """
+        var text = builder();
+        for (var i = 0; i < 3; i = i + 1) append(text, i);
+        append(text, nil);
+        print text;
+        print [len(text), text[1]];
+        writefile("{path}", text);
+        print build(text) + "!";
+    """.replace("{path}", str(path))
+
+    run(source)
+
+    assert "012nil\n[6,1]\n012nil!\n" == capsys.readouterr().out
+    assert "012nil" == path.read_text()
+
+
+def test_interpret_deletes_files(capsys, tmp_path):
+    path = tmp_path / "scratch.txt"
+    source = """
+        writefile("{path}", "scratch");
+        deletefile("{path}");
+        deletefile("{path}");
+    """.replace("{path}", str(path))
+
+    run(source)
+
+    assert "deletefile: File cannot be found.\n" == capsys.readouterr().out
+    assert not path.exists()
+
+
+def test_interpret_string_natives(capsys):
+    source = """
+        var line = trim("  12:05 WARN  disk at 91.5%  ");
+        var fields = split(line, nil);
+        print fields;
+        print [find(line, "WARN"), find(line, "ERROR"), len(split("a,,b", ","))];
+        print number(replace(fields[4], "%", "")) + 1;
+        print number("abc");
+        print join([upper(substr(line, 6, 10)), lower("DISK"), 1], "-");
+        print startswith(line, "12:");
+    """
+
+    run(source)
+
+    assert "[12:05,WARN,disk,at,91.5%]\n[6,-1,3]\n92.5\nnil\nWARN-disk-1\nTrue\n" == capsys.readouterr().out
+
+
+def test_interpret_prints_large_arrays_in_chunks(capsys):
+    source = """
+        var numbers = array(10000);
+        fill(numbers, 1.5);
+        var mixed = array(5000);
+        fill(mixed, "a");
+        mixed[4999] = numbers;
+        print numbers;
+        print mixed;
+    """
+
+    interpreter = run(source)
+
+    numbers = "[" + ",".join(["1.5"] * 10000) + "]"
+    assert numbers + "\n" + "[" + ",".join(["a"] * 4999) + "," + numbers + "]\n" == capsys.readouterr().out
+    assert not interpreter.output.parts
+
+
+def test_interpret_flushes_output_before_reporting_errors(capsys):
+    source = """
+        print "before";
+        print -"after";
+    """
+
+    run(source)
+
+    assert "before\nOperand must be a number.\n[line 3]\n" == capsys.readouterr().out
+
+
+def test_interpret_flushes_output_before_reporting_import_errors(monkeypatch, tmp_path):
+    bad = tmp_path / "bad.lox"
+    bad.write_text("var x = ;")
+    source = """
+        print "before";
+        import {bad};
+    """.replace("{bad}", str(bad))
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stdout", stream)
+    monkeypatch.setattr("sys.stderr", stream)
+
+    run(source)
+
+    assert "before\n[line 1] Error at ';': Expect expression.\n" == stream.getvalue()
+
+
+def test_interpret_file_handles(capsys, tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("first\nsecond\nthird\n\nlast")
+    source = """
+        var file = open("{path}", "r");
+        print readline(file);
+        print readchunk(file, 3);
+        print readline(file);
+        eachline(file, fun (line) { print "<" + line + ">"; });
+        print readline(file);
+        close(file);
+        readline(file);
+    """.replace("{path}", str(path))
+
+    interpreter = run(source)
+
+    assert "first\nsec\nond\n<third>\n<>\n<last>\nnil\nreadline: File is closed.\n" == capsys.readouterr().out
+    assert not interpreter.files
+
+
+def test_interpret_closes_files_on_exit(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("line\n")
+
+    interpreter = run('var file = open("{path}", "r");'.replace("{path}", str(path)))
+    handle = interpreter.globals.values["file"]
+    assert handle.is_open()
+
+    interpreter.close()
+
+    assert not handle.is_open()
+    assert not interpreter.files
+
+
+def test_interpret_mapped_file(capsys, tmp_path):
+    path = tmp_path / "mapped.txt"
+    path.write_bytes(b"header;value\xe9;end")
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    source = """
+        var text = mapfile("{path}");
+        print len(text);
+        print text[7] + text[12];
+        var start = find(text, ";") + 1;
+        print substr(text, start, find(text, ";end"));
+        print find(text, "missing");
+        print text;
+        print len(mapfile("{empty}"));
+        print [text == readfile("{path}"), text == mapfile("{path}"), text == "header"];
+        mapfile("{directory}");
+    """.replace("{path}", str(path)).replace("{empty}", str(empty)).replace("{directory}", str(tmp_path))
+
+    run(source)
+
+    assert (
+        "17\nv\xe9\nvalue\xe9\n-1\nheader;value\xe9;end\n0\n[True,True,False]\n"
+        "mapfile: File cannot be opened.\n"
+    ) == capsys.readouterr().out
+
+
+def test_interpret_bytes(capsys, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes([0, 1, 2, 200, 255]))
+    copied = tmp_path / "copied.bin"
+    source = """
+        var data = readbytes("{path}");
+        print [len(data), data[3]];
+        var tail = view(data, 2, 5, 1);
+        tail[0] = 7;
+        print data;
+        var head = slice(data, 0, 2);
+        head[0] = 9;
+        print data[0];
+        print values(view(data, 0, 5, 2));
+        print decode(bytes("lox"));
+        var numbers = [1, 2, 3];
+        print bytes(numbers) == bytes(decode(bytes(numbers)));
+        writefile("{copied}", tail);
+        data[0] = 256;
+    """.replace("{path}", str(path)).replace("{copied}", str(copied))
+
+    run(source)
+
+    assert "[5,200]\nbytes[0,1,7,200,255]\n0\n[0,7,255]\nlox\nTrue\nByte must be an integer from 0 to 255.\n[line 15]\n" == capsys.readouterr().out
+    assert bytes([7, 200, 255]) == copied.read_bytes()
+
+
+def test_interpret_bytes_files_that_cannot_be_opened(capsys, tmp_path):
+    run('readbytes("{directory}");'.replace("{directory}", str(tmp_path)))
+    run('writefile("{missing}", bytes("lox"));'.replace("{missing}", str(tmp_path / "missing" / "data.bin")))
+
+    assert "readbytes: File cannot be opened.\nwritefile: File cannot be opened.\n" == capsys.readouterr().out
+
+
+def test_interpret_writable_file_handles(capsys, tmp_path):
+    path = tmp_path / "log.txt"
+    source = """
+        var log = open("{path}", "w");
+        write(log, "first ");
+        write(log, 1);
+        flush(log);
+        print readfile("{path}");
+        close(log);
+        log = open("{path}", "a");
+        write(log, [2, "x"]);
+        close(log);
+        print readfile("{path}");
+        readline(open("{path}", "w"));
+    """.replace("{path}", str(path))
+
+    run(source)
+
+    assert "first 1\nfirst 1[2,x]\nreadline: File is not open for reading.\n" == capsys.readouterr().out
+
+
+def test_interpret_flushes_files_on_runtime_errors(capsys, tmp_path):
+    path = tmp_path / "log.txt"
+    source = """
+        var log = open("{path}", "w");
+        write(log, "written");
+        print -log;
+    """.replace("{path}", str(path))
+
+    interpreter = run(source)
+
+    assert "Operand must be a number.\n[line 4]\n" == capsys.readouterr().out
+    assert "written" == path.read_text()
+    interpreter.close()
+
+
+def test_interpret_asynchronous_io(capsys, tmp_path):
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text("one")
+    source = """
+        var written = writeasync("{second}", "two");
+        print await(written);
+        var reads = [readasync("{first}"), readasync("{second}")];
+        var output = shell("echo three");
+        print gather(reads);
+        print await(output);
+        print await(output);
+        await(readasync("{directory}"));
+    """.replace("{first}", str(first)).replace("{second}", str(second)).replace("{directory}", str(tmp_path))
+
+    interpreter = run(source)
+    interpreter.close()
+
+    assert "nil\n[one,two]\nthree\n\nthree\n\nawait: Is a directory.\n" == capsys.readouterr().out
+    assert interpreter.loop is None
+
+
+def test_interpret_reads_stdin(capsys, monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("first\nsecond\nthird\nfourth\n"))
+    source = """
+        print readline(stdin);
+        eachline(stdin, fun (line) { if (line == "second") print line; });
+        print readline(stdin);
+    """
+
+    run(source)
+
+    assert "first\nsecond\nnil\n" == capsys.readouterr().out
+
+
+def test_interpret_reads_stdin_in_the_repl(capsys, monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("print readline(stdin);\nread by the script\nprint 1;\n"))
+    Lox.had_error = False
+
+    Lox.run_prompt()
+
+    assert "> read by the script\n> 1\n> " == capsys.readouterr().out
+
+
+def test_interpret_imports_each_file_once(capsys, tmp_path):
+    base = tmp_path / "base.lox"
+    base.write_text('print "base";')
+    (tmp_path / "left.lox").write_text("import {base}; import {right};".format(base=base, right=tmp_path / "right.lox"))
+    (tmp_path / "right.lox").write_text("import {base}; import {left};".format(base=base, left=tmp_path / "left.lox"))
+    source = """
+        import {left};
+        import {right};
+        for (var i = 0; i < 2; i = i + 1) { import {base}; }
+        reload("{base}");
+    """.replace("{left}", str(tmp_path / "left.lox")).replace("{right}", str(tmp_path / "right.lox")).replace("{base}", str(base))
+
+    interpreter = run(source)
+    assert "base\nbase\n" == capsys.readouterr().out
+
+    os.utime(base, ns=(0, 0))
+    Lox.run("import {};".format(base), interpreter)
+    assert "base\n" == capsys.readouterr().out
+
+
+def test_interpret_imports_parsed_ahead_of_time(capsys, tmp_path):
+    leaf = tmp_path / "leaf.lox"
+    leaf.write_text('print "leaf";')
+    broken = tmp_path / "broken.lox"
+    broken.write_text("print ;")
+    middle = tmp_path / "middle.lox"
+    middle.write_text("import {leaf};\nprint \"middle\";".format(leaf=leaf))
+    source = "import {middle};\nimport {broken};".format(middle=middle, broken=broken)
+
+    parsed = parse_imports(source, 2)
+    assert {str(middle), str(leaf)} == set(parsed)
+
+    interpreter = Interpreter(Lox)
+    interpreter.parsed = parsed
+    Lox.had_error = False
+    Lox.run(source, interpreter)
+
+    captured = capsys.readouterr()
+    assert "leaf\nmiddle\n" == captured.out
+    assert "[line 1] Error at ';': Expect expression.\n" == captured.err
+    assert not interpreter.parsed
+
+
+def unpicklable_file(path: str):
+    raise pickle.PicklingError("Can't pickle the statements.")
+
+
+def dying_worker(path: str):
+    os._exit(1)
+
+
+@pytest.mark.parametrize("parse_file", [unpicklable_file, dying_worker])
+def test_interpret_imports_parsed_when_workers_fail(capsys, monkeypatch, tmp_path, parse_file):
+    leaf = tmp_path / "leaf.lox"
+    leaf.write_text('print "leaf";')
+    source = "import {leaf};".format(leaf=leaf)
+    monkeypatch.setattr(frontend, "parse_file", parse_file)
+
+    parsed = parse_imports(source, 1)
+    assert {} == parsed
+
+    interpreter = Interpreter(Lox)
+    interpreter.parsed = parsed
+    Lox.had_error = False
+    Lox.run(source, interpreter)
+
+    assert "leaf\n" == capsys.readouterr().out
@@ -0,0 +1,69 @@
+import pytest
+
+from lox_array import LoxArray, LoxArrayView
+
+
+@pytest.mark.parametrize("elements, expected_typed", [
+    ([], True),
+    ([1.0, 2.0], True),
+    ([1.0, None], False),
+    ([1.0, "a"], False),
+    ([True], False),
+])
+def test_lox_array_typed_only_when_all_numbers(elements: list, expected_typed: bool):
+    lox_array = LoxArray(elements)
+
+    assert expected_typed == lox_array.is_typed()
+    assert elements == list(lox_array.elements)
+
+
+def test_lox_array_becomes_typed_once_filled_with_numbers():
+    lox_array = LoxArray([None, None])
+
+    lox_array.set(0, 1.0)
+    assert not lox_array.is_typed()
+    lox_array.set(1, 2.0)
+
+    assert lox_array.is_typed()
+    assert "[1,2]" == str(lox_array)
+
+
+def test_lox_array_stays_list_once_untyped():
+    lox_array = LoxArray([1.0, 2.0])
+
+    lox_array.set(0, "a")
+    lox_array.set(0, 3.0)
+
+    assert not lox_array.is_typed()
+    assert [3.0, 2.0] == lox_array.elements
+
+
+def test_lox_array_equality_ignores_storage():
+    lox_array = LoxArray([1.0, 2.0])
+    lox_array.set(1, None)
+    lox_array.set(1, 2.0)
+
+    assert LoxArray([1.0, 2.0]) == lox_array
+    assert LoxArray([1.0, 2.0]) != LoxArray([1.0, None])
+
+
+def test_lox_array_view_of_view_shares_root_storage():
+    lox_array = LoxArray([0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+    view = LoxArrayView(LoxArrayView(lox_array, range(1, 6, 2)), range(1, 3, 1))
+
+    view.set(0, 30.0)
+    lox_array.set(5, "a")
+
+    assert view.root is lox_array
+    assert [30.0, "a"] == list(view.elements)
+    assert [0.0, 1.0, 2.0, 30.0, 4.0, "a"] == lox_array.elements
+
+
+def test_lox_array_view_replace_writes_through():
+    lox_array = LoxArray([0.0, 1.0, 2.0, 3.0])
+    view = LoxArrayView(lox_array, range(0, 4, 2))
+
+    view.replace([2.0, 0.0])
+
+    assert 2 == len(view)
+    assert "[2,1,0,3]" == str(lox_array)
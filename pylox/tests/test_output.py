@@ -0,0 +1,42 @@
+import io
+
+from lox_array import LoxArray
+from output import Output
+
+
+def test_output_buffers_until_size():
+    stream = io.StringIO()
+    output = Output(stream, size=9)
+
+    output.print("abc")
+    assert "" == stream.getvalue()
+
+    output.print("defg")
+    assert "abc\ndefg\n" == stream.getvalue()
+
+    output.print(1.0)
+    output.flush()
+    assert "abc\ndefg\n1\n" == stream.getvalue()
+
+
+def test_output_writes_through_without_buffer():
+    stream = io.StringIO()
+    output = Output(stream, size=0)
+
+    output.print(None)
+
+    assert "nil\n" == stream.getvalue()
+
+
+def test_output_streams_large_arrays():
+    stream = io.StringIO()
+    output = Output(stream, size=0)
+    output.chunk = 2
+    writes = []
+    stream.write = lambda text: writes.append(text)
+    array = LoxArray([1.0, 2.0, 3.0, 4.0, 5.0])
+
+    output.write_value(array)
+
+    assert str(array) == "".join(writes)
+    assert max(len(text) for text in writes) < len(str(array))
@@ -2,7 +2,7 @@ from unittest.mock import Mock
 import pytest
 from tests.conftest import Any
 
-from expr import Assign, Binary, Call, Expr, Get, Grouping, Lambda, Literal, Logical, Set, Ternary, This, Unary, Variable
+from expr import Assign, Binary, Call, Expr, Get, Grouping, HashMap, HashSet, Lambda, Literal, Logical, Set, Ternary, This, Unary, Variable
 from lox_token import Token
 from parser import Parser, ParseException
 from scanner import Scanner
@@ -268,8 +268,46 @@ def test_expression_parse_nested_assignments():
     assert isinstance(actual_expr.value.value, Lambda)
 
 
+def test_expression_parse_map():
+    source = '#{"key": 1, other: fun(a){print a;}}'
+
+    parser = Parser(Mock(), scan_tokens(source))
+    actual_expr = parser.expression()
+
+    assert isinstance(actual_expr, HashMap)
+    assert "key" == actual_expr.keys[0].value
+    assert "other" == actual_expr.keys[1].name.lexeme
+    assert isinstance(actual_expr.values[0], Literal)
+    assert isinstance(actual_expr.values[1], Lambda)
+
+
+def test_expression_parse_empty_map():
+    source = "#{}"
+
+    parser = Parser(Mock(), scan_tokens(source))
+    actual_expr = parser.expression()
+
+    assert isinstance(actual_expr, HashMap)
+    assert [] == actual_expr.keys
+
+
+def test_expression_parse_hash_set():
+    source = "#{a ? 1 : 2, 3}"
+
+    parser = Parser(Mock(), scan_tokens(source))
+    actual_expr = parser.expression()
+
+    assert isinstance(actual_expr, HashSet)
+    assert isinstance(actual_expr.elements[0], Ternary)
+    assert isinstance(actual_expr.elements[1], Literal)
+
+
 @pytest.mark.parametrize("source, expected_error", [
     ("", "Expect expression."),
+    ("#{1: 2", "Expect '}' to complete map."),
+    ("#{1: 2, 3}", "Expect ':' after map key."),
+    ("#{1, 2", "Expect '}' to complete set."),
+    ("#[1]", "Expect '{' after '#'."),
     ("(1", "Expect ')' after expression."),
     ("object.", "Expect property name after '.'."),
     ("f(arg", "Expect ')' after arguments."),
@@ -56,6 +56,7 @@ def test_scan_token_correct_literal(source: str, expected_token_literal: object)
 
 @pytest.mark.parametrize("source, expected_token_types", [
     ("", (TokenType.EOF,)),
+    ("#{}", (TokenType.HASH, TokenType.LEFT_BRACE, TokenType.RIGHT_BRACE, TokenType.EOF)),
     ("<==", (TokenType.LESS_EQUAL, TokenType.EQUAL, TokenType.EOF)),
     (";// line comment\n;", (TokenType.SEMICOLON, TokenType.SEMICOLON, TokenType.EOF)),
 ])
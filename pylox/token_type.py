@@ -18,6 +18,7 @@ class TokenType(Enum):
     STAR = auto()
     EROTEME = auto()
     COLON = auto()
+    HASH = auto()
 
     # One or two character tokens.
     BANG = auto()
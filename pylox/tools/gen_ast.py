@@ -21,6 +21,8 @@ class GenerateAST:
                 "Index    ; objekt: Expr, index: Expr, bracket: Token",
                 "Get      ; objekt: Expr, name: Token",
                 "Grouping ; expression: Expr",
+                "HashMap  ; keys: list[Expr], values: list[Expr], brace: Token",
+                "HashSet  ; elements: list[Expr], brace: Token",
                 "Lambda   ; params: list[Token], body: list['Stmt']",
                 "Literal  ; value: object",
                 "Logical  ; left: Expr, operator: Token, right: Expr",